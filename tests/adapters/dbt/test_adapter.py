@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from unstar.adapters.dbt import DbtAdapter
+from unstar.adapters.dbt.index import IndexedDbtModel, index_path
+from unstar.core.adapters import ModelTarget
+
+
+class TestDbtAdapter:
+    def test_downstream_columns_union(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_manifest(
+                tmpdir,
+                {
+                    "base": ([], "select * from raw"),
+                    "b": (["base"], "select id, name from base"),
+                    "c": (["base"], "select id, email from base"),
+                },
+            )
+            adapter = DbtAdapter()
+            targets = {t.name: t for t in adapter.list_models(tmpdir, None, None)}
+
+            scope = adapter.get_downstream_columns(tmpdir, targets["base"])
+            assert scope == {"": ["email", "id", "name"]}
+            assert adapter.get_downstream_columns(tmpdir, targets["b"]) == {}
+
+    def test_local_order_groups_shared_dependents(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_manifest(
+                tmpdir,
+                {
+                    "a": ([], "select 1"),
+                    "x": ([], "select 1"),
+                    "b": ([], "select 1"),
+                    "joined": (["a", "b"], "select id from a join b using (id)"),
+                    "solo": (["x"], "select y from x"),
+                },
+            )
+            adapter = DbtAdapter()
+            adapter.list_models(tmpdir, None, None)
+            targets = [ModelTarget(name, f"{name}.sql") for name in ("a", "x", "b")]
+
+            assert [t.name for t in adapter.local_order(targets)] == ["a", "b", "x"]
+
+    def test_release_evicts_after_last_parent(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_manifest(
+                tmpdir,
+                {
+                    "a": ([], "select 1"),
+                    "b": ([], "select 1"),
+                    "joined": (["a", "b"], "select id from a join b using (id)"),
+                },
+            )
+            adapter = DbtAdapter()
+            adapter.low_memory = True
+            targets = {t.name: t for t in adapter.list_models(tmpdir, None, None)}
+            adapter.local_order([targets["a"], targets["b"]])
+
+            assert adapter.get_downstream_columns(tmpdir, targets["a"]) == {"": ["id"]}
+            assert adapter.get_downstream_columns(tmpdir, targets["b"]) == {"": ["id"]}
+            joined = adapter._artifacts.models_by_name["joined"]
+            assert joined.compiled_sql is None
+
+            adapter.release(targets["a"])
+            assert joined.node_id in adapter._usage
+            adapter.release(targets["b"])
+            assert joined.node_id not in adapter._usage
+
+    def test_low_memory_maps_index_and_keeps_only_dependent_sql(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_manifest(
+                tmpdir,
+                {
+                    "a": ([], "select 1"),
+                    "b": ([], "select 1"),
+                    "joined": (["a"], "select id from a"),
+                },
+            )
+            adapter = DbtAdapter()
+            adapter.low_memory = True
+            targets = {t.name: t for t in adapter.list_models(tmpdir, None, None)}
+            assert isinstance(adapter._artifacts.models_by_name["a"], IndexedDbtModel)
+            assert Path(index_path(tmpdir)).exists()
+
+            adapter.local_order([targets["a"]])
+            models = adapter._artifacts.models_by_name
+            assert models["b"].compiled_sql is None
+            assert models["joined"].compiled_sql == "select id from a"
+            assert adapter.get_downstream_columns(tmpdir, targets["a"]) == {"": ["id"]}
+
+    def test_release_counts_only_planned_parents(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_manifest(
+                tmpdir,
+                {
+                    "a": ([], "select 1"),
+                    "b": ([], "select 1"),
+                    "joined": (["a", "b"], "select id from a join b using (id)"),
+                },
+            )
+            adapter = DbtAdapter()
+            adapter.low_memory = True
+            targets = {t.name: t for t in adapter.list_models(tmpdir, None, None)}
+            adapter.local_order([targets["a"]])
+
+            assert adapter.get_downstream_columns(tmpdir, targets["a"]) == {"": ["id"]}
+            adapter.release(targets["a"])
+            assert adapter._usage == {}
+
+            # Released dependents are analysed again from reloaded artifacts
+            assert adapter.get_downstream_columns(tmpdir, targets["b"]) == {"": ["id"]}
+            adapter.local_order([targets["a"]])
+            assert adapter.get_downstream_columns(tmpdir, targets["a"]) == {"": ["id"]}
+
+    def test_affected_models_include_parents(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_manifest(
+                tmpdir,
+                {
+                    "base": ([], "select * from raw"),
+                    "other": ([], "select * from raw"),
+                    "child": (["base"], "select id from base"),
+                },
+            )
+            adapter = DbtAdapter()
+            changed = [str(Path(tmpdir) / "models" / "child.sql"), "/elsewhere/x.sql"]
+
+            affected = adapter.affected_models(tmpdir, changed)
+            assert [t.name for t in affected] == ["child", "base"]
+
+    def test_uncompiled_dependents_rendered_locally(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_manifest(
+                tmpdir,
+                {"base": ([], "select * from raw"), "child": (["base"], None)},
+                raw={
+                    "child": "{{ config(materialized='view') }}\n"
+                    "select id, name from {{ ref('base') }}\n"
+                    "{% if is_incremental() %}where loaded_at > 0{% endif %}"
+                },
+            )
+            adapter = DbtAdapter()
+            targets = {t.name: t for t in adapter.list_models(tmpdir, None, None)}
+            scope = adapter.get_downstream_columns(tmpdir, targets["base"])
+            assert scope == {"": ["id", "name"]}
+
+    def test_project_vars_rendered(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_manifest(
+                tmpdir,
+                {"base": ([], "select * from raw"), "child": (["base"], None)},
+                raw={"child": "select {{ var('key_column') }}, name from {{ ref('base') }}"},
+            )
+            Path(tmpdir, "dbt_project.yml").write_text("name: test\nvars:\n  key_column: user_id\n")
+            adapter = DbtAdapter()
+            targets = {t.name: t for t in adapter.list_models(tmpdir, None, None)}
+            scope = adapter.get_downstream_columns(tmpdir, targets["base"])
+            assert scope == {"": ["name", "user_id"]}
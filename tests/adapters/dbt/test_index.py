@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from unstar.adapters.dbt import index
+from unstar.adapters.dbt.artifacts import load_artifacts
+from unstar.adapters.dbt.index import IndexedDbtModel, build_index, open_index
+
+
+def _project(write_manifest, tmpdir: str, compiled_b: str = "SELECT a, b FROM model_a") -> str:
+    return write_manifest(
+        tmpdir,
+        {"model_a": ([], None), "model_b": (["model_a"], compiled_b)},
+        raw={
+            "model_a": "SELECT * FROM {{ source('s', 't') }}",
+            "model_b": "SELECT a, b FROM {{ ref('model_a') }} -- ✓",
+        },
+    )
+
+
+class TestDbtIndex:
+    def test_roundtrip(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = _project(write_manifest, tmpdir)
+            expected = load_artifacts(tmpdir)
+            build_index(tmpdir)
+
+            indexed = load_artifacts(tmpdir)
+            assert isinstance(indexed.models_by_name["model_b"], IndexedDbtModel)
+            for name, model in expected.models_by_name.items():
+                got = indexed.models_by_name[name]
+                assert got.path == model.path
+                assert got.node_id == model.node_id
+                assert got.depends_on == model.depends_on
+                assert got.raw_sql == model.raw_sql
+                assert got.compiled_sql == model.compiled_sql
+            assert open_index(tmpdir, manifest) is not None
+
+    def test_sql_can_be_evicted(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = _project(write_manifest, tmpdir)
+            build_index(tmpdir)
+            model = open_index(tmpdir, manifest).models_by_name["model_b"]
+            model.compiled_sql = None
+            assert model.compiled_sql is None
+
+    def test_touched_manifest_still_valid(self, monkeypatch, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = _project(write_manifest, tmpdir)
+            build_index(tmpdir)
+            st = os.stat(manifest)
+            os.utime(manifest, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            assert open_index(tmpdir, manifest) is not None
+
+            # The new mtime is stored, so the manifest is not hashed again
+            monkeypatch.setattr(index, "_sha256", lambda path: pytest.fail("hashed again"))
+            indexed = open_index(tmpdir, manifest)
+            assert indexed.models_by_name["model_b"].compiled_sql == "SELECT a, b FROM model_a"
+
+    def test_missing_model_files_warned(self, capsys, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = _project(write_manifest, tmpdir)
+            build_index(tmpdir)
+            capsys.readouterr()
+            assert open_index(tmpdir, manifest) is not None
+            assert "Model file not found" in capsys.readouterr().out
+
+    def test_changed_manifest_invalidates(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = _project(write_manifest, tmpdir)
+            build_index(tmpdir)
+            _project(write_manifest, tmpdir, compiled_b="SELECT a, c FROM model_a")
+            assert open_index(tmpdir, manifest) is None
+            assert load_artifacts(tmpdir).models_by_name["model_b"].compiled_sql == (
+                "SELECT a, c FROM model_a"
+            )
+
+    def test_other_manifest_or_corrupt_index(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = _project(write_manifest, tmpdir)
+            path = build_index(tmpdir)
+            other = Path(tmpdir) / "other.json"
+            other.write_text(Path(manifest).read_text())
+            assert open_index(tmpdir, str(other)) is None
+
+            Path(path).write_bytes(b"garbage")
+            assert open_index(tmpdir, manifest) is None
+            Path(path).write_bytes(b"")
+            assert open_index(tmpdir, manifest) is None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from unstar.adapters.dbt.jinja import JinjaRenderer
+from unstar.core.sql import collect_columns
+
+
+class TestJinjaRenderer:
+    def test_ref_source_config(self):
+        renderer = JinjaRenderer()
+        sql = (
+            "{{ config(materialized='table') }}\n"
+            "select u.id, o.total from {{ ref('users') }} u\n"
+            "join {{ source('shop', 'orders') }} o on o.user_id = u.id"
+        )
+        assert renderer.render(sql) == (
+            "\nselect u.id, o.total from users u\njoin shop.orders o on o.user_id = u.id"
+        )
+
+    def test_is_incremental_renders_full_refresh(self):
+        renderer = JinjaRenderer()
+        sql = (
+            "select id, updated_at from {{ ref('events') }}\n"
+            "{%- if is_incremental() %}\n"
+            "where updated_at > (select max(updated_at) from {{ this }})\n"
+            "{% else %}\n"
+            "where backfilled\n"
+            "{% endif %}"
+        )
+        rendered = renderer.render_model("model", sql)
+        assert "max(updated_at)" not in rendered
+        assert "where backfilled" in rendered
+
+    def test_var_defaults_and_values(self):
+        renderer = JinjaRenderer(variables={"start": "'2024-01-01'"})
+        sql = "select * from t where d >= {{ var('start') }} and x = {{ var('x', 3) }} {# c #}"
+        assert renderer.render(sql) == "select * from t where d >= '2024-01-01' and x = 3 "
+        assert JinjaRenderer().render("{{ var('missing') }}") == "NULL"
+
+    def test_simple_macro(self):
+        macros = {
+            "cents_to_dollars": (
+                "{% macro cents_to_dollars(column, scale=2) %}"
+                "round({{ column }} / 100, {{ scale }})"
+                "{% endmacro %}"
+            )
+        }
+        renderer = JinjaRenderer(macros)
+        sql = "select {{ cents_to_dollars('amount_cents') }} as amount from t"
+        assert renderer.render(sql) == "select round(amount_cents / 100, 2) as amount from t"
+
+    def test_unknown_expression_still_parses(self):
+        renderer = JinjaRenderer()
+        sql = "select {{ dbt_utils.generate_surrogate_key(['a', 'b']) }} as sk, c from t"
+        assert collect_columns(renderer.render(sql)) == {"c"}
+
+    def test_render_model_cached(self):
+        renderer = JinjaRenderer()
+        first = renderer.render_model("m", "select a from {{ ref('x') }}")
+        assert renderer.render_model("m", "select a from {{ ref('x') }}") is first
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from unstar.adapters.dbt import mesh
+from unstar.adapters.dbt.artifacts import load_artifacts, parse_manifest
+from unstar.adapters.dbt.mesh import EDGES_FILE, cross_project_children, read_workspace
+from unstar.core.cache import cache_path
+
+
+def _mesh(tmpdir: str, write_manifest) -> tuple[str, str, str]:
+    root = Path(tmpdir)
+    projects = {
+        "core": {"orders": ([], "select * from raw")},
+        "finance": {"revenue": (["model.core.orders"], "select amount from orders")},
+        "other": {"x": ([], "select 1")},
+    }
+    for name, models in projects.items():
+        write_manifest(root / name, models, project=name)
+    return str(root / "core"), str(root / "finance"), str(root / "other")
+
+
+class TestMesh:
+    def test_cross_project_children(self, monkeypatch, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            core, finance, other = _mesh(tmpdir, write_manifest)
+            primary = load_artifacts(core)
+
+            children = cross_project_children(primary, [(finance, None), (other, None)])
+            assert [m.node_id for m in children["model.core.orders"]] == ["model.finance.revenue"]
+
+            with open(cache_path(core, EDGES_FILE)) as f:
+                cached = json.load(f)
+            assert cached["edges"] == {"model.core.orders": [[0, "model.finance.revenue"]]}
+
+            # Served from the edge cache; the unrelated project is not loaded
+            loaded = []
+
+            def tracking_parse(project):
+                loaded.append(project[0])
+                return parse_manifest(*project)
+
+            monkeypatch.setattr(mesh, "_parse_consumer", tracking_parse)
+            children = cross_project_children(primary, [(finance, None), (other, None)])
+            assert [m.node_id for m in children["model.core.orders"]] == ["model.finance.revenue"]
+            assert loaded == [finance]
+
+    def test_invalid_consumer_manifest_raises(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            core, finance, other = _mesh(tmpdir, write_manifest)
+            Path(finance, "target", "manifest.json").write_text("{not json")
+
+            with pytest.raises(ValueError, match="cannot read manifest"):
+                cross_project_children(load_artifacts(core), [(finance, None), (other, None)])
+
+    def test_read_workspace(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "workspace.json"
+            path.write_text(
+                json.dumps(
+                    {
+                        "projects": [
+                            {"project_dir": "core"},
+                            {"project_dir": "finance", "manifest": "finance/m.json"},
+                        ]
+                    }
+                )
+            )
+            assert read_workspace(str(path)) == [
+                (os.path.join(tmpdir, "core"), None),
+                (os.path.join(tmpdir, "finance"), os.path.join(tmpdir, "finance", "m.json")),
+            ]
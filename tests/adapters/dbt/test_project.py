@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from unstar.adapters.dbt.project import read_project_vars
+
+PROJECT_YML = """\
+name: 'shop'
+version: '1.0'
+vars:
+  id_column: customer_id  # surrogate key
+  enabled: true
+  shop:
+    amount_column: "amount_usd"
+    id_column: shop_customer_id
+  other_package:
+    ignored: x
+models:
+  shop:
+    +materialized: view
+"""
+
+
+class TestProjectVars:
+    @pytest.mark.parametrize("with_yaml", [True, False])
+    def test_global_and_scoped_vars(self, monkeypatch, with_yaml):
+        if not with_yaml:
+            # Falls back to the built-in reader when PyYAML is not installed
+            monkeypatch.setitem(sys.modules, "yaml", None)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "dbt_project.yml").write_text(PROJECT_YML)
+            assert read_project_vars(tmpdir) == {
+                "id_column": "shop_customer_id",
+                "enabled": "true",
+                "amount_column": "amount_usd",
+            }
+
+    def test_missing_project_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            assert read_project_vars(tmpdir) == {}
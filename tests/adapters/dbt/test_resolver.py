@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from unstar.adapters.dbt.artifacts import DbtArtifacts, DbtModel
-from unstar.adapters.dbt.resolver import find_models_by_names, find_models_by_path
+from unstar.adapters.dbt.resolver import (
+    build_child_index,
+    find_models_by_names,
+    find_models_by_path,
+)
 
 
 class TestDbtResolver:
@@ -40,3 +44,18 @@ class TestDbtResolver:
         artifacts = DbtArtifacts("/test", {})
         result = list(find_models_by_path(artifacts, None))
         assert len(result) == 0
+
+    def test_build_child_index(self):
+        artifacts = DbtArtifacts(
+            project_dir="/test",
+            models_by_name={
+                "model_a": DbtModel("model_a", "/path/a.sql", [], "id1", None, None),
+                "model_b": DbtModel("model_b", "/path/b.sql", ["id1"], "id2", None, None),
+                "model_c": DbtModel("model_c", "/path/c.sql", ["id1", "id2"], "id3", None, None),
+            },
+        )
+
+        children = build_child_index(artifacts)
+        assert [m.name for m in children["id1"]] == ["model_b", "model_c"]
+        assert [m.name for m in children["id2"]] == ["model_c"]
+        assert "id3" not in children
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from unstar.adapters.sql.graph import INDEX_FILE, load_project
+from unstar.core.cache import cache_path
+from unstar.core.graph import build_child_index
+
+
+def _write(root: str, rel: str, sql: str) -> None:
+    path = Path(root) / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(sql)
+
+
+class TestSqlGraph:
+    def test_dependencies_from_from_and_join(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write(tmpdir, "views/users.sql", "SELECT * FROM raw.users")
+            _write(tmpdir, "views/orders.sql", "SELECT * FROM raw.orders")
+            _write(
+                tmpdir,
+                "marts/report.sql",
+                "WITH u AS (SELECT id, name FROM Users) "
+                "SELECT u.name, o.total FROM u JOIN orders o ON o.user_id = u.id",
+            )
+
+            project = load_project(tmpdir)
+            assert set(project.models_by_name) == {"users", "orders", "report"}
+            report = project.models_by_name["report"]
+            assert report.depends_on == ["orders", "users"]
+            assert {"id", "name", "total", "user_id"} <= set(report.columns)
+
+            children = build_child_index(project.models_by_name.values())
+            assert [m.name for m in children["users"]] == ["report"]
+
+    def test_parallel_parse_matches_serial(self):
+        with tempfile.TemporaryDirectory() as serial, tempfile.TemporaryDirectory() as parallel:
+            for root in (serial, parallel):
+                _write(root, "a.sql", "SELECT * FROM raw")
+                _write(root, "b.sql", "SELECT x, y FROM a")
+                _write(root, "c.sql", "SELECT a.x, b.y FROM a JOIN b ON a.x = b.x")
+
+            expected = load_project(serial).models_by_name
+            got = load_project(parallel, jobs=2).models_by_name
+            assert {n: (m.depends_on, m.columns) for n, m in got.items()} == {
+                n: (m.depends_on, m.columns) for n, m in expected.items()
+            }
+
+    def test_index_reused_and_refreshed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write(tmpdir, "a.sql", "SELECT * FROM src")
+            _write(tmpdir, "b.sql", "SELECT x FROM a")
+            load_project(tmpdir)
+
+            index_path = cache_path(tmpdir, INDEX_FILE)
+            with open(index_path) as f:
+                index = json.load(f)
+            assert set(index["files"]) == {"a.sql", "b.sql"}
+
+            # A tampered entry with a matching stat is trusted, proving no re-parse
+            index["files"]["b.sql"]["columns"] = ["cached"]
+            with open(index_path, "w") as f:
+                json.dump(index, f)
+            assert load_project(tmpdir).models_by_name["b"].columns == ["cached"]
+
+            _write(tmpdir, "b.sql", "SELECT y, z FROM a")
+            st = os.stat(Path(tmpdir) / "b.sql")
+            os.utime(Path(tmpdir) / "b.sql", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            assert load_project(tmpdir).models_by_name["b"].columns == ["y", "z"]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+
+def _write_manifest(
+    project_dir: str | Path,
+    models: dict[str, tuple[list[str], str | None]],
+    *,
+    project: str = "test",
+    raw: dict[str, str | None] | None = None,
+    files: dict[str, str] | None = None,
+    code_keys: bool = False,
+) -> str:
+    """Write a dbt project with ``models`` (name -> (deps, compiled SQL)).
+
+    Dependencies are model names of the same project or full node ids. ``files``
+    are written to ``models/<name>.sql``; ``code_keys`` uses the field names of
+    dbt >= 1.3 manifests. Returns the manifest path.
+    """
+
+    raw = raw or {}
+    root = Path(project_dir)
+    (root / "target").mkdir(parents=True, exist_ok=True)
+    (root / "dbt_project.yml").write_text(f"name: {project}")
+    for name, content in (files or {}).items():
+        (root / "models").mkdir(exist_ok=True)
+        (root / "models" / f"{name}.sql").write_text(content)
+
+    path_key, compiled_key, raw_key = (
+        ("original_file_path", "compiled_code", "raw_code")
+        if code_keys
+        else ("path", "compiled_sql", "raw_sql")
+    )
+    nodes = {
+        f"model.{project}.{name}": {
+            "resource_type": "model",
+            "name": name,
+            path_key: f"models/{name}.sql",
+            "depends_on": {
+                "nodes": [d if "." in d else f"model.{project}.{d}" for d in deps],
+            },
+            compiled_key: sql,
+            raw_key: raw.get(name),
+        }
+        for name, (deps, sql) in models.items()
+    }
+    manifest = root / "target" / "manifest.json"
+    manifest.write_text(json.dumps({"nodes": nodes}))
+    return str(manifest)
+
+
+@pytest.fixture
+def write_manifest():
+    """Factory writing a minimal dbt project and manifest; see ``_write_manifest``."""
+
+    return _write_manifest
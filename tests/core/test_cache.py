@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from unstar.core.cache import cache_path, load_json, save_json
+
+
+class TestCache:
+    def test_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = cache_path(tmpdir, "data.json")
+            assert load_json(path) is None
+            save_json(path, {"a": [1, 2]})
+            assert load_json(path) == {"a": [1, 2]}
+
+    def test_concurrent_writers_in_one_process(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = cache_path(tmpdir, "data.json")
+            payloads = [{"writer": i, "rows": list(range(2000))} for i in range(8)]
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda data: save_json(path, data), payloads * 4))
+            assert load_json(path) in payloads
+            assert sorted(os.listdir(os.path.dirname(path))) == [".gitignore", "data.json"]
+
+    def test_cache_dir_ignored_by_git(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_json(cache_path(tmpdir, "data.json"), {})
+            with open(cache_path(tmpdir, ".gitignore"), encoding="utf-8") as f:
+                assert "*" in f.read().splitlines()
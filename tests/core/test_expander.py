@@ -6,12 +6,12 @@ from unstar.core.expander import expand_select_stars
 class TestExpandSelectStars:
     def test_no_stars_unchanged(self):
         sql = "SELECT a, b FROM table"
-        scope = {"": {"a", "b"}}
+        scope = {"": ["a", "b"]}
         assert expand_select_stars(sql, scope) == sql
 
     def test_simple_star_expansion(self):
         sql = "SELECT * FROM table"
-        scope = {"": {"a", "b", "c"}}
+        scope = {"": ["a", "b", "c"]}
         result = expand_select_stars(sql, scope)
         # Should expand to explicit columns with proper formatting
         expected = "select\n    a,\n    b,\n    c\nFROM table"
@@ -21,7 +21,7 @@ class TestExpandSelectStars:
         # The new regex approach only handles unqualified SELECT *
         # Qualified stars are not supported in the current implementation
         sql = "SELECT t.* FROM table t"
-        scope = {"t": {"a", "b"}}
+        scope = {"t": ["a", "b"]}
         result = expand_select_stars(sql, scope)
         # Should remain unchanged since we don't handle qualified stars
         assert result == sql
@@ -29,7 +29,7 @@ class TestExpandSelectStars:
     def test_mixed_stars_and_columns(self):
         # The new regex approach expands SELECT * but leaves other columns
         sql = "SELECT *, id FROM table"
-        scope = {"": {"a", "b"}}
+        scope = {"": ["a", "b"]}
         result = expand_select_stars(sql, scope)
         # Should expand SELECT * to explicit columns but keep the rest
         expected = "select\n    a,\n    b\n, id FROM table"
@@ -42,19 +42,19 @@ class TestExpandSelectStars:
 
     def test_empty_scope_unchanged(self):
         sql = "SELECT * FROM table"
-        scope = {"": set()}
+        scope = {"": []}
         assert expand_select_stars(sql, scope) == sql
 
     def test_invalid_sql_unchanged(self):
         sql = "INVALID SQL"
-        scope = {"": {"a"}}
+        scope = {"": ["a"]}
         assert expand_select_stars(sql, scope) == sql
 
     def test_distinct_preserved(self):
         # The new regex approach only handles pure SELECT * patterns
         # DISTINCT and other modifiers are not supported in the current implementation
         sql = "SELECT DISTINCT * FROM table"
-        scope = {"": {"a", "b"}}
+        scope = {"": ["a", "b"]}
         result = expand_select_stars(sql, scope)
         # Should remain unchanged since we don't handle DISTINCT
         assert result == sql
@@ -62,7 +62,7 @@ class TestExpandSelectStars:
     def test_multiple_qualified_stars(self):
         # The new regex approach only handles unqualified SELECT *
         sql = "SELECT t1.*, t2.* FROM table1 t1 JOIN table2 t2 ON t1.id = t2.id"
-        scope = {"t1": {"a", "b"}, "t2": {"c", "d"}}
+        scope = {"t1": ["a", "b"], "t2": ["c", "d"]}
         result = expand_select_stars(sql, scope)
         # Should remain unchanged since we don't handle qualified stars
         assert result == sql
@@ -70,14 +70,14 @@ class TestExpandSelectStars:
     def test_cte_with_star(self):
         # The new regex approach only handles lines that start with SELECT *
         sql = "WITH cte AS (SELECT * FROM table) SELECT * FROM cte"
-        scope = {"": {"a", "b"}}
+        scope = {"": ["a", "b"]}
         result = expand_select_stars(sql, scope)
         # Should remain unchanged since the line doesn't start with SELECT *
         assert result == sql
 
     def test_join_with_ambiguous_columns(self):
         sql = "SELECT * FROM table1 t1 JOIN table2 t2 ON t1.id = t2.id"
-        scope = {"": {"a", "b", "c", "d"}}
+        scope = {"": ["a", "b", "c", "d"]}
         result = expand_select_stars(sql, scope)
         # Should expand to all available columns
         expected = (
@@ -89,7 +89,7 @@ class TestExpandSelectStars:
         # This test would require mocking sqlglot import
         # For now, just test that function doesn't crash
         sql = "SELECT * FROM table"
-        scope = {"": {"a"}}
+        scope = {"": ["a"]}
         result = expand_select_stars(sql, scope)
         # Should either expand or return unchanged
         assert isinstance(result, str)
@@ -99,7 +99,7 @@ class TestExpandSelectStars:
         sql = """-- Test model with SELECT * for unstar
 select *
 from {{ ref('stg_users') }}"""
-        scope = {"": {"id", "name", "email"}}
+        scope = {"": ["email", "id", "name"]}
         result = expand_select_stars(sql, scope)
         # Should preserve Jinja template and expand SELECT *
         expected = """-- Test model with SELECT * for unstar
@@ -116,7 +116,7 @@ from {{ ref('stg_users') }}"""
 select *
 from table
 -- Another comment"""
-        scope = {"": {"a", "b"}}
+        scope = {"": ["a", "b"]}
         result = expand_select_stars(sql, scope)
         expected = """-- This is a comment
 select
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from unstar.core.git import changed_files
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(cwd: str, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _repo(tmpdir: str) -> str:
+    _git(tmpdir, "init", "-q")
+    _git(tmpdir, "config", "user.email", "t@example.com")
+    _git(tmpdir, "config", "user.name", "t")
+    project = Path(tmpdir) / "project"
+    project.mkdir()
+    (project / "a.sql").write_text("select 1")
+    (project / "b.sql").write_text("select 2")
+    (Path(tmpdir) / "outside.sql").write_text("select 3")
+    _git(tmpdir, "add", ".")
+    _git(tmpdir, "commit", "-q", "-m", "init")
+    return str(project)
+
+
+class TestChangedFiles:
+    def test_staged_and_working_tree(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = _repo(tmpdir)
+            Path(project, "a.sql").write_text("select 10")
+            Path(project, "new.sql").write_text("select 4")
+            Path(tmpdir, "outside.sql").write_text("select 30")
+
+            assert changed_files(project, staged=True) == []
+            assert changed_files(project) == [
+                os.path.join(project, "a.sql"),
+                os.path.join(project, "new.sql"),
+            ]
+
+            _git(project, "add", "a.sql")
+            assert changed_files(project, staged=True) == [os.path.join(project, "a.sql")]
+
+    def test_changed_since_ref(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = _repo(tmpdir)
+            Path(project, "b.sql").write_text("select 20")
+            _git(tmpdir, "commit", "-q", "-am", "change b")
+            assert changed_files(project, "HEAD~1") == [os.path.join(project, "b.sql")]
+            assert changed_files(project) == []
+
+    def test_bad_ref(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = _repo(tmpdir)
+            with pytest.raises(RuntimeError):
+                changed_files(project, "no-such-ref")
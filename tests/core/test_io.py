@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from unstar.core.io import existing_files, prefetch
+
+
+class TestExistingFiles:
+    def test_reports_only_present_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a.sql").write_text("select 1")
+            (Path(tmpdir) / "sub").mkdir()
+            present = os.path.join(tmpdir, "a.sql")
+            missing = os.path.join(tmpdir, "b.sql")
+            directory = os.path.join(tmpdir, "sub")
+            nested = os.path.join(tmpdir, "nope", "c.sql")
+
+            assert existing_files([present, missing, directory, nested]) == {present}
+
+    def test_empty(self):
+        assert existing_files([]) == set()
+
+
+class TestPrefetch:
+    def test_preserves_order(self):
+        results = [(item, fut.result()) for item, fut in prefetch(lambda x: x * 2, range(20), 3)]
+        assert results == [(i, i * 2) for i in range(20)]
+
+    def test_errors_surface_on_result(self):
+        def load(x):
+            if x == 1:
+                raise FileNotFoundError("missing")
+            return x
+
+        it = prefetch(load, [0, 1, 2], 2)
+        assert next(it)[1].result() == 0
+        with pytest.raises(FileNotFoundError):
+            next(it)[1].result()
+        assert next(it)[1].result() == 2
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from unstar.core.memory import current_rss, format_size, parse_size, peak_rss, read_ahead
+
+
+class TestMemory:
+    def test_parse_size(self):
+        assert parse_size("512") == 512 * 1024**2
+        assert parse_size("512M") == 512 * 1024**2
+        assert parse_size("4G") == 4 * 1024**3
+        assert parse_size("1.5gb") == int(1.5 * 1024**3)
+        assert parse_size("100K") == 100 * 1024
+
+    def test_parse_size_invalid(self):
+        with pytest.raises(ValueError):
+            parse_size("lots")
+        with pytest.raises(ValueError):
+            parse_size("0")
+        for text in ("inf", "nan", "-infG"):
+            with pytest.raises(ValueError):
+                parse_size(text)
+
+    def test_format_size(self):
+        assert format_size(3 * 1024**2) == "3.0 MB"
+
+    def test_read_ahead_bounded_by_budget(self):
+        assert read_ahead(64 * 1024**2, [1024, 2048], 8) == 8
+        assert read_ahead(64 * 1024**2, [1024**2], 8) == 4
+        assert read_ahead(1024**2, [1024**2], 8) == 1
+        assert read_ahead(1024**2, [], 8) == 8
+
+    def test_rss_reported(self):
+        peak = peak_rss()
+        current = current_rss()
+        if peak is not None and current is not None:
+            assert peak > 0 and current > 0
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+
+from unstar.core.graph import (
+    affected_targets,
+    build_child_index,
+    fanout_cost,
+    find_by_path,
+    select_targets,
+)
+
+
+@dataclass
+class Model:
+    name: str
+    path: str
+    depends_on: list[str] = field(default_factory=list)
+
+
+def _models(root: str) -> dict[str, Model]:
+    return {
+        "a": Model("a", os.path.join(root, "staging", "a.sql")),
+        "b": Model("b", os.path.join(root, "marts", "b.sql"), ["a"]),
+        "c": Model("c", os.path.join(root, "marts", "c.sql"), ["a", "b"]),
+    }
+
+
+class TestGraph:
+    def test_select_dedups_and_defaults_to_all(self, tmp_path):
+        models = _models(str(tmp_path))
+        picked = [models["b"], models["b"], *find_by_path(models, str(tmp_path), "marts")]
+        assert [t.name for t in select_targets(picked, models)] == ["b", "c"]
+        assert [t.name for t in select_targets([], models)] == ["a", "b", "c"]
+
+    def test_child_index_and_fanout_cost(self, tmp_path):
+        models = _models(str(tmp_path))
+        children = build_child_index(models.values())
+        assert [m.name for m in children["a"]] == ["b", "c"]
+        assert fanout_cost(models["a"], children["a"], lambda m: len(m.name)) == 6
+
+    def test_affected_includes_parents(self, tmp_path):
+        models = _models(str(tmp_path))
+        by_path = {m.path: m for m in models.values()}
+        changed = [models["c"].path, str(tmp_path / "missing.sql")]
+        assert [t.name for t in affected_targets(changed, by_path, models.get)] == ["c", "a", "b"]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from unstar.core.savings import RelationStats, estimate_savings, format_bytes, rank, type_width
+
+
+class TestTypeWidth:
+    def test_common_types(self):
+        assert type_width("BOOLEAN") == 1
+        assert type_width("varchar(256)") == 32
+        assert type_width("STRING") == 32
+        assert type_width("bigint") == 8
+        assert type_width("smallint") == 2
+        assert type_width("date") == 4
+        assert type_width("timestamp_ntz") == 8
+        assert type_width("numeric(38,2)") == 16
+        assert type_width("VARIANT") == 64
+        assert type_width("something_else") == 16
+
+
+class TestEstimateSavings:
+    def test_bytes_apportioned_by_width(self):
+        rel = RelationStats("raw", {"id": "bigint", "note": "text", "flag": "boolean"}, 4100)
+        s = estimate_savings("m", "m.sql", ["ID", "flag"], [rel])
+        assert (s.total_columns, s.pruned_columns) == (3, 1)
+        assert s.scanned_bytes == 4100
+        assert s.pruned_bytes == 4100 * 32 // 41
+
+    def test_unknown_size(self):
+        rel = RelationStats("raw", {"id": "int", "x": "int"}, None)
+        s = estimate_savings("m", "m.sql", ["id"], [rel])
+        assert s.pruned_columns == 1
+        assert s.scanned_bytes is None and s.pruned_bytes is None
+
+    def test_without_catalog_data(self):
+        s = estimate_savings("m", "m.sql", ["a", "b"], [])
+        assert (s.kept_columns, s.total_columns, s.pruned_columns) == (2, 0, 0)
+        assert s.scanned_bytes is None
+
+    def test_rank_and_format(self):
+        a = estimate_savings("a", "a.sql", [], [RelationStats("t", {"x": "int"}, None)])
+        b = estimate_savings("b", "b.sql", [], [RelationStats("t", {"x": "int"}, 100)])
+        assert [s.name for s in rank([a, b])] == ["b", "a"]
+        assert format_bytes(10) == "10 B"
+        assert format_bytes(2048) == "2.0 KB"
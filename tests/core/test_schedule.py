@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import tempfile
+
+from unstar.core.schedule import expected_seconds, load_timings, parallel_map, save_timings
+
+
+class TestSchedule:
+    def test_expected_seconds_from_cost(self):
+        assert expected_seconds({"a": 1, "b": 30}, {}) == {"a": 1.0, "b": 30.0}
+
+    def test_history_overrides_estimate(self):
+        costs = {"a": 10, "b": 20, "c": 25}
+        # 10s over a cost of 30 measured, so c (no history) is expected to take ~8.3s
+        expected = expected_seconds(costs, {"a": 1.0, "b": 9.0})
+        assert expected["a"] == 1.0 and expected["b"] == 9.0
+        assert abs(expected["c"] - 25 / 3) < 1e-9
+
+    def test_timings_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            assert load_timings(tmpdir) == {}
+            save_timings(tmpdir, {"a": 2.0})
+            save_timings(tmpdir, {"a": 4.0, "b": 1.0})
+            assert load_timings(tmpdir) == {"a": 3.0, "b": 1.0}
+
+    def test_parallel_map_keeps_input_order(self):
+        items = ["a", "ccc", "bb", "dddd"]
+        assert parallel_map(str.upper, items, 1) == ["A", "CCC", "BB", "DDDD"]
+        assert parallel_map(str.upper, items, 2) == ["A", "CCC", "BB", "DDDD"]
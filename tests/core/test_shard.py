@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from unstar.core.adapters import ModelTarget
+from unstar.core.shard import assign_shards, parse_shard
+
+
+def _targets(*names: str) -> list[ModelTarget]:
+    return [ModelTarget(name, f"/p/{name}.sql") for name in names]
+
+
+class TestShard:
+    def test_parse_shard(self):
+        assert parse_shard("1/4") == (1, 4)
+        assert parse_shard("4/4") == (4, 4)
+
+    @pytest.mark.parametrize("text", ["0/4", "5/4", "1/0", "x/2", "1-2"])
+    def test_parse_shard_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_shard(text)
+
+    def test_balanced_by_cost(self):
+        costs = {"big": 100, "a": 40, "b": 30, "c": 30}
+        shards = assign_shards(_targets("a", "b", "big", "c"), 2, lambda t: costs[t.name])
+        assert [[t.name for t in s] for s in shards] == [["big"], ["a", "b", "c"]]
+
+    def test_every_target_assigned_once(self):
+        targets = _targets(*(f"m{i}" for i in range(25)))
+        shards = assign_shards(targets, 4, lambda t: len(t.name))
+        names = sorted(t.name for s in shards for t in s)
+        assert names == sorted(t.name for t in targets)
+        # Same input gives the same split
+        assert shards == assign_shards(targets, 4, lambda t: len(t.name))
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import random
+import sys
+
+from unstar.core.symbols import SymbolTable, merge_unique, union
+
+
+class TestSymbolTable:
+    def test_intern_is_stable(self):
+        table = SymbolTable()
+        assert table.intern("a") == 0
+        assert table.intern("b") == 1
+        assert table.intern("a") == 0
+        assert len(table) == 2
+
+    def test_encode_decode_roundtrip(self):
+        table = SymbolTable()
+        ids = table.encode(["c", "a", "b", "a"])
+        assert table.decode(ids) == ["a", "b", "c"]
+
+    def test_encode_empty(self):
+        table = SymbolTable()
+        assert len(table.encode([])) == 0
+        assert table.decode(table.encode([])) == []
+
+    def test_union_merges_sets(self):
+        table = SymbolTable()
+        first = table.encode(["id", "name"])
+        second = table.encode(["id", "email"])
+        assert table.decode(union([first, second])) == ["email", "id", "name"]
+        assert len(union([])) == 0
+
+    def test_large_ids(self):
+        table = SymbolTable()
+        for i in range(1000):
+            table.intern(f"col_{i}")
+        ids = table.encode(["col_999", "col_3"])
+        assert table.decode(ids) == ["col_3", "col_999"]
+
+    def test_memory_stays_proportional_to_set_size(self):
+        # Late models hold high ids; storage must not grow with the id range
+        table = SymbolTable()
+        names = [f"col_{i}" for i in range(100_000)]
+        for name in names:
+            table.intern(name)
+        rng = random.Random(0)
+        sets = [table.encode(rng.sample(names, 10)) for _ in range(20_000)]
+        assert len(table) == 100_000
+        total = sum(sys.getsizeof(ids) for ids in sets)
+        assert total < 20_000 * 200  # ~4 bytes per id plus the array header
+        merged = union(sets[:100])
+        assert list(merged) == sorted(set().union(*sets[:100]))
+
+    def test_merge_unique_keeps_order(self):
+        runs = [["a", "c", "d"], ["b", "c"], [], ["a", "e"]]
+        assert list(merge_unique(runs)) == ["a", "b", "c", "d", "e"]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from unstar import Cancelled, Project
+from unstar.core.memo import load_memo
+from unstar.core.schedule import load_timings
+
+
+def _make_project(tmpdir: str, write_manifest) -> None:
+    write_manifest(
+        tmpdir,
+        {
+            "users": ([], "select * from raw"),
+            "report": (["users"], "select id, email from users"),
+        },
+        files={
+            "users": "select *\nfrom {{ ref('raw') }}\n",
+            "report": "select id from {{ ref('users') }}\n",
+        },
+        code_keys=True,
+    )
+
+
+class TestApi:
+    def test_open_missing_project(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(FileNotFoundError):
+                Project.open(tmpdir)
+
+    def test_expand(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            session = Project.open(tmpdir)
+
+            result = session.expand("users")
+            assert result.changed
+            assert result.columns == ["email", "id"]
+            assert result.new_sql == "select\n    email,\n    id\nfrom {{ ref('raw') }}\n"
+            assert not session.expand("report").changed
+
+            with pytest.raises(KeyError):
+                session.expand("missing")
+
+    def test_expand_many_and_write(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            session = Project.open(tmpdir)
+
+            results = list(session.expand_many())
+            assert [r.name for r in results] == ["users", "report"]
+
+            session.write(results[0], backup=True)
+            users = Path(tmpdir) / "models" / "users.sql"
+            assert users.read_text() == results[0].new_sql
+            assert Path(f"{users}.bak").exists()
+
+    def test_cancel(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            session = Project.open(tmpdir)
+            cancel = threading.Event()
+
+            it = session.expand_many(["users", "report"], cancel=cancel)
+            assert next(it).name == "users"
+            cancel.set()
+            with pytest.raises(Cancelled):
+                next(it)
+
+    def test_threads_share_session(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            session = Project.open(tmpdir)
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(session.expand, ["users"] * 16))
+            assert {tuple(r.columns) for r in results} == {("email", "id")}
+
+    def test_max_memory_matches_default(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            default = [(r.name, r.new_sql) for r in Project.open(tmpdir).expand_many()]
+            bounded = Project.open(tmpdir, max_memory=64 * 1024**2, memo=False)
+            assert [(r.name, r.new_sql) for r in bounded.expand_many()] == default
+            # Evicted state is rebuilt, not reused, on the next run
+            assert [(r.name, r.new_sql) for r in bounded.expand_many()] == default
+            assert bounded.expand("users").columns == ["email", "id"]
+
+    def test_scheduled_run_matches_default(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            default = {r.name: r.new_sql for r in Project.open(tmpdir).expand_many()}
+            session = Project.open(tmpdir, memo=False)
+            assert {r.name: r.new_sql for r in session.expand_many(jobs=2)} == default
+            # Parse times of the dependents, used to order the pool next time
+            assert set(session.timings) == {"model.test.report"}
+            assert set(load_timings(tmpdir)) == {"model.test.report"}
+
+    def test_unchanged_targets_replay_stored_results(self, monkeypatch, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            first = {r.name: r for r in Project.open(tmpdir).expand_many()}
+
+            def fail(sql, scope):
+                raise AssertionError("expander called for an unchanged target")
+
+            monkeypatch.setattr("unstar.api.expand_select_stars", fail)
+            replayed = {r.name: r for r in Project.open(tmpdir).expand_many()}
+            assert replayed == first
+
+            # A changed dependent invalidates the stored result
+            manifest = Path(tmpdir) / "target" / "manifest.json"
+            data = json.loads(manifest.read_text())
+            data["nodes"]["model.test.report"]["compiled_code"] = "select id from users"
+            manifest.write_text(json.dumps(data))
+            monkeypatch.undo()
+            result = Project.open(tmpdir).expand("users")
+            assert result.columns == ["id"]
+
+    def test_collects_only_when_rss_grows(self, monkeypatch, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            budget = 64 * 1024**2
+            calls = []
+            monkeypatch.setattr("unstar.api.current_rss", lambda: 2 * budget)
+            monkeypatch.setattr("unstar.api.gc.collect", lambda: calls.append(1))
+
+            assert len(list(Project.open(tmpdir, max_memory=budget).expand_many())) == 2
+            assert len(calls) == 1
+
+    def test_memo_hits_skip_warm(self, monkeypatch, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            list(Project.open(tmpdir).expand_many())
+
+            warmed = []
+            monkeypatch.setattr(
+                "unstar.adapters.dbt.DbtAdapter.warm",
+                lambda self, targets, jobs, history: warmed.extend(targets) or {},
+            )
+            list(Project.open(tmpdir).expand_many(jobs=2))
+            assert warmed == []
+
+    def test_expand_stores_result(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            Project.open(tmpdir).expand("users")
+            assert set(load_memo(tmpdir)) == {"users"}
+
+    def test_memo_off_stores_nothing(self, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _make_project(tmpdir, write_manifest)
+            list(Project.open(tmpdir, memo=False).expand_many())
+            assert not (Path(tmpdir) / ".unstar" / "results.json").exists()
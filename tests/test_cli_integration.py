@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import json
+import os
+import shutil
+import subprocess
 import tempfile
 from pathlib import Path
 
@@ -63,7 +66,7 @@ class TestCliIntegration:
 
     def test_invalid_adapter(self):
         with pytest.raises(SystemExit) as exc_info:
-            main(["--adapter", "sql", "--dry-run"])
+            main(["--adapter", "nope", "--dry-run"])
         assert exc_info.value.code == 2
 
     def test_mutually_exclusive_modes(self):
@@ -101,3 +104,146 @@ class TestCliIntegration:
                 ["--adapter", "dbt", "--project-dir", tmpdir, "--dry-run", "--reporter", "github"]
             )
             assert result == 0
+
+    def test_sql_adapter(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "users.sql").write_text("select *\nfrom raw_users\n")
+            (Path(tmpdir) / "report.sql").write_text("select id, email from users\n")
+
+            result = main(["--adapter", "sql", "--project-dir", tmpdir, "--dry-run"])
+            assert result == 1
+            assert "Model users: SELECT * → email, id" in capsys.readouterr().out
+
+    def test_shard_and_merge(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("a", "b", "c"):
+                (Path(tmpdir) / f"{name}.sql").write_text("select *\nfrom raw\n")
+                (Path(tmpdir) / f"use_{name}.sql").write_text(f"select id_{name} from {name}\n")
+
+            files = []
+            for index in (1, 2):
+                out = str(Path(tmpdir) / f"shard{index}.json")
+                files.append(out)
+                args = ["--adapter", "sql", "--project-dir", tmpdir, "--dry-run"]
+                main([*args, "--shard", f"{index}/2", "--results-file", out])
+            capsys.readouterr()
+
+            assert main(["merge", *files]) == 1
+            lines = capsys.readouterr().out.splitlines()
+            assert lines == [
+                "Model a: SELECT * → id_a",
+                "Model b: SELECT * → id_b",
+                "Model c: SELECT * → id_c",
+            ]
+
+            assert main(["merge", files[0]]) == 2
+            # The same shard twice would report every result twice
+            assert main(["merge", *files, files[1]]) == 2
+            assert "shard 2 given more than once" in capsys.readouterr().out
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_staged_only_checks_affected_models(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("a", "b"):
+                (Path(tmpdir) / f"{name}.sql").write_text("select *\nfrom raw\n")
+                (Path(tmpdir) / f"use_{name}.sql").write_text(f"select id_{name} from {name}\n")
+            for args in (["init", "-q"], ["add", "."]):
+                subprocess.run(["git", *args], cwd=tmpdir, check=True)
+
+            result = main(["--adapter", "sql", "--project-dir", tmpdir, "--dry-run", "--staged"])
+            assert result == 1
+            assert len(capsys.readouterr().out.splitlines()) == 2
+
+            env = {"GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@e", "GIT_COMMITTER_NAME": "t"}
+            env.update(GIT_COMMITTER_EMAIL="t@e", PATH=os.environ["PATH"])
+            subprocess.run(["git", "commit", "-qm", "init"], cwd=tmpdir, check=True, env=env)
+            (Path(tmpdir) / "use_b.sql").write_text("select id_b, extra from b\n")
+            subprocess.run(["git", "add", "use_b.sql"], cwd=tmpdir, check=True)
+
+            result = main(["--adapter", "sql", "--project-dir", tmpdir, "--dry-run", "--staged"])
+            assert result == 1
+            assert capsys.readouterr().out.splitlines() == ["Model b: SELECT * → extra, id_b"]
+
+    def test_mesh_consumers_contribute_columns(self, capsys, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            projects = {}
+            for name, models in {
+                "core": {"orders": ([], "select * from raw")},
+                "finance": {"revenue": (["model.core.orders"], "select amount, id from orders")},
+            }.items():
+                root = Path(tmpdir) / name
+                files = dict.fromkeys(models, "select *\nfrom raw\n")
+                write_manifest(root, models, project=name, files=files)
+                projects[name] = str(root)
+
+            workspace = Path(tmpdir) / "workspace.json"
+            workspace.write_text(
+                json.dumps({"projects": [{"project_dir": "core"}, {"project_dir": "finance"}]})
+            )
+
+            assert main(["--project-dir", projects["core"], "--dry-run"]) == 0
+            args = ["--workspace", str(workspace), "--dry-run"]
+            assert main(args) == 1
+            assert "Model orders: SELECT * → amount, id" in capsys.readouterr().out
+            args = ["--project-dir", projects["core"], "--project-dir", projects["finance"]]
+            assert main([*args, "--dry-run"]) == 1
+
+            # A missing consumer project or manifest is an error, not fewer columns
+            missing = os.path.join(tmpdir, "missing")
+            assert main(["--project-dir", projects["core"], "--project-dir", missing]) == 2
+            manifest = os.path.join(projects["finance"], "target", "manifest.json")
+            with open(manifest, "w") as f:
+                f.write("{not json")
+            assert main(args) == 2
+            assert "cannot read manifest" in capsys.readouterr().out
+            os.remove(manifest)
+            assert main(args) == 2
+            assert "manifest not found" in capsys.readouterr().out
+
+    def test_savings_reporter(self, capsys, write_manifest):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            write_manifest(
+                tmpdir,
+                {
+                    "orders": ([], "select * from raw"),
+                    "revenue": (["orders"], "select id, amount from orders"),
+                },
+                project="shop",
+                files={
+                    "orders": "select *\nfrom raw\n",
+                    "revenue": "select id, amount from orders\n",
+                },
+            )
+            columns = {"id": "bigint", "amount": "bigint", "payload": "variant", "note": "text"}
+            catalog = {
+                "nodes": {
+                    "model.shop.orders": {
+                        "metadata": {"name": "orders"},
+                        "columns": {c.upper(): {"name": c, "type": t} for c, t in columns.items()},
+                        "stats": {"num_bytes": {"value": 1120, "include": True}},
+                    }
+                },
+                "sources": {},
+            }
+            (root / "target" / "catalog.json").write_text(json.dumps(catalog))
+
+            args = ["--project-dir", tmpdir, "--dry-run", "--reporter", "savings"]
+            assert main([*args, "--select", "orders"]) == 1
+            out = capsys.readouterr().out.splitlines()
+            assert out == [
+                "orders (models/orders.sql): prune 2 of 4 columns, ~960 B of 1.1 KB scanned",
+                "Total: 1 models, prune 2 of 4 columns, ~960 B of 1.1 KB scanned",
+            ]
+
+    def test_savings_reporter_without_catalog(self, capsys):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a.sql").write_text("select * from raw\n")
+            (Path(tmpdir) / "b.sql").write_text("select x, y from a\n")
+
+            args = ["--adapter", "sql", "--project-dir", tmpdir, "--dry-run"]
+            assert main([*args, "--reporter", "savings"]) == 1
+            assert capsys.readouterr().out.splitlines() == [
+                "a (a.sql): expands to 2 columns, no catalog data",
+                "Total: 1 models; 1 without catalog data (see 'dbt docs generate')",
+            ]
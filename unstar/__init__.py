@@ -1,2 +1,4 @@
-__all__ = ["__version__"]
+from .api import Cancelled, ExpansionResult, Project, Session
+
+__all__ = ["Cancelled", "ExpansionResult", "Project", "Session", "__version__"]
 __version__ = "0.1.0"
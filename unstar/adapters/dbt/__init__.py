@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import time
+from array import array
 from collections.abc import Iterable, Sequence
 
 from ...core.adapters import Adapter, ModelTarget, register_adapter
-from .artifacts import DbtModel, load_artifacts
-from .columns import infer_downstream_columns
-from .resolver import find_models_by_names, find_models_by_path
+from ...core.graph import affected_targets, fanout_cost, select_targets
+from ...core.savings import RelationStats
+from ...core.schedule import expected_seconds, parallel_map
+from ...core.sql import collect_columns
+from ...core.symbols import SymbolTable, union
+from .artifacts import DbtArtifacts, DbtModel, default_manifest_path, load_artifacts
+from .catalog import default_catalog_path, load_catalog
+from .jinja import JinjaRenderer
+from .mesh import cross_project_children
+from .project import read_project_vars
+from .resolver import build_child_index, find_models_by_names, find_models_by_path
+
+
+def _timed_collect(item: tuple[str, str]) -> tuple[set[str], float]:
+    started = time.perf_counter()
+    columns = collect_columns(item[1])
+    return columns, time.perf_counter() - started
 
 
 class DbtAdapter(Adapter):
@@ -17,6 +34,195 @@ class DbtAdapter(Adapter):
 
     def __init__(self):
         self._project_dir = None
+        self._manifest_path = None
+        self._artifacts: DbtArtifacts | None = None
+        self._children: dict[str, list[DbtModel]] = {}
+        self._symbols = SymbolTable()
+        self._renderer = JinjaRenderer()
+        self._catalog: dict[str, RelationStats] | None = None
+        self._usage: dict[str, array] = {}
+        self._pending: dict[str, int] = {}  # dependent id -> planned targets not yet done
+        self._released: set[str] = set()  # dependents whose SQL and column ids were dropped
+        self._models_by_id: dict[str, DbtModel] = {}
+        self._models_by_path: dict[str, DbtModel] = {}
+
+    def _load(self, project_dir: str, manifest_path: str | None = None) -> DbtArtifacts | None:
+        """Load artifacts once per project and reuse them for every target."""
+
+        if manifest_path is None and project_dir == self._project_dir:
+            manifest_path = self._manifest_path
+        if (
+            self._artifacts is not None
+            and project_dir == self._project_dir
+            and manifest_path == self._manifest_path
+        ):
+            return self._artifacts
+
+        self._project_dir = project_dir
+        self._manifest_path = manifest_path
+        self._artifacts = load_artifacts(project_dir, manifest_path, self.low_memory)
+        self._children = build_child_index(self._artifacts) if self._artifacts else {}
+        if self._artifacts is not None and self.extra_projects:
+            cross = cross_project_children(self._artifacts, self.extra_projects)
+            for parent, consumers in cross.items():
+                self._children.setdefault(parent, []).extend(consumers)
+        self._renderer = JinjaRenderer(
+            self._artifacts.macros if self._artifacts else None, read_project_vars(project_dir)
+        )
+        models = self._artifacts.models_by_name.values() if self._artifacts else ()
+        self._models_by_id = {m.node_id: m for m in models}
+        self._models_by_path = {m.path: m for m in models}
+        self._usage = {}
+        self._pending = {}
+        self._released = set()
+        self._catalog = None
+        return self._artifacts
+
+    def _dependents(self, project_dir: str, target: ModelTarget) -> list[DbtModel] | None:
+        """Direct dependents of ``target``, or None when it is not a known model."""
+
+        artifacts = self._load(project_dir)
+        model = artifacts.models_by_name.get(target.name) if artifacts else None
+        if model is None:
+            return None
+        children = self._children.get(model.node_id, [])
+        if any(c.node_id in self._released for c in children):
+            # Their SQL is gone in low-memory mode; reload the artifacts to analyse them again
+            pending = self._pending
+            self._artifacts = None
+            self._load(project_dir)
+            self._pending = pending
+            return self._dependents(project_dir, target)
+        return children
+
+    def _usage_ids(self, model: DbtModel) -> array:
+        """Column ids referenced by ``model``'s SQL, parsed once per model."""
+
+        ids = self._usage.get(model.node_id)
+        if ids is None:
+            sql = self._analysis_sql(model)
+            ids = self._store_usage(model, collect_columns(sql) if sql else set())
+        return ids
+
+    def _analysis_sql(self, model: DbtModel) -> str | None:
+        """Compiled SQL, or the raw template rendered locally when not compiled."""
+
+        if model.compiled_sql:
+            return model.compiled_sql
+        if model.raw_sql:
+            return self._renderer.render_model(model.name, model.raw_sql)
+        return None
+
+    def _store_usage(self, model: DbtModel, columns: set[str]) -> array:
+        ids = self._symbols.encode(columns)
+        self._usage[model.node_id] = ids
+        if self.low_memory:
+            # The text is only needed to compute the column ids
+            model.raw_sql = model.compiled_sql = None
+        return ids
+
+    def warm(self, targets, jobs, history=None):  # type: ignore[override]
+        if self._project_dir is None:
+            return {}
+
+        # Each dependent is parsed once, however many targets share it
+        pending: dict[str, DbtModel] = {}
+        for t in targets:
+            for child in self._dependents(self._project_dir, t) or ():
+                if child.node_id not in self._usage:
+                    pending[child.node_id] = child
+
+        models = list(pending.values())
+        items = [(m.node_id, self._analysis_sql(m) or "") for m in models]
+        expected = expected_seconds({k: len(sql) + 1 for k, sql in items}, history or {})
+        parsed = parallel_map(_timed_collect, items, jobs, size=lambda item: expected[item[0]])
+
+        timings: dict[str, float] = {}
+        for model, (columns, seconds) in zip(models, parsed):
+            self._store_usage(model, columns)
+            timings[model.node_id] = seconds
+        return timings
+
+    def estimate_cost(self, target: ModelTarget) -> int:
+        model = self._artifacts.models_by_name.get(target.name) if self._artifacts else None
+        if model is None:
+            return super().estimate_cost(target)
+
+        children = self._children.get(model.node_id, ())
+        return fanout_cost(model, children, lambda m: len(m.compiled_sql or m.raw_sql or ""))
+
+    def upstream_relations(self, target: ModelTarget) -> list[RelationStats]:
+        model = self._artifacts.models_by_name.get(target.name) if self._artifacts else None
+        if model is None:
+            return []
+        if self._catalog is None:
+            manifest = self._manifest_path or default_manifest_path(self._project_dir)
+            self._catalog = load_catalog(default_catalog_path(manifest))
+
+        # The star reads the model's parents; fall back to its own output columns
+        relations = [self._catalog[dep] for dep in model.depends_on if dep in self._catalog]
+        if not relations and model.node_id in self._catalog:
+            relations = [self._catalog[model.node_id]]
+        return relations
+
+    def local_order(self, targets):  # type: ignore[override]
+        if self._artifacts is None:
+            return list(targets)
+
+        # Union-find over targets that share a dependent
+        root: dict[str, str] = {t.name: t.name for t in targets}
+
+        def find(name: str) -> str:
+            while root[name] != name:
+                root[name] = root[root[name]]
+                name = root[name]
+            return name
+
+        owner: dict[str, str] = {}
+        for t in targets:
+            model = self._artifacts.models_by_name.get(t.name)
+            if model is None:
+                continue
+            for child in self._children.get(model.node_id, ()):
+                first = owner.setdefault(child.node_id, t.name)
+                root[find(t.name)] = find(first)
+
+        # Count each dependent's parents among the targets for release()
+        self._pending = {}
+        for t in targets:
+            model = self._artifacts.models_by_name.get(t.name)
+            for child in self._children.get(model.node_id, ()) if model else ():
+                self._pending[child.node_id] = self._pending.get(child.node_id, 0) + 1
+        if self.low_memory:
+            # Only the dependents' SQL is analysed in this run; drop everyone else's
+            for m in self._artifacts.models_by_name.values():
+                if m.node_id not in self._pending and m.node_id not in self._usage:
+                    m.raw_sql = m.compiled_sql = None
+                    self._released.add(m.node_id)
+
+        groups: dict[str, list[ModelTarget]] = {}
+        for t in targets:
+            groups.setdefault(find(t.name), []).append(t)
+        return [t for group in groups.values() for t in group]
+
+    def release(self, target: ModelTarget) -> None:
+        if self._artifacts is None:
+            return
+        model = self._artifacts.models_by_name.get(target.name)
+        if model is None:
+            return
+
+        # A dependent's column ids can go once every planned parent has been expanded
+        for child in self._children.get(model.node_id, ()):
+            remaining = self._pending.get(child.node_id)
+            if remaining is None:
+                continue  # not planned by local_order()
+            if remaining > 1:
+                self._pending[child.node_id] = remaining - 1
+            else:
+                del self._pending[child.node_id]
+                if self._usage.pop(child.node_id, None) is not None and self.low_memory:
+                    self._released.add(child.node_id)
 
     def detect(self, project_dir: str) -> bool:  # pragma: no cover - simple stub
         return os.path.exists(os.path.join(project_dir, "dbt_project.yml"))
@@ -28,67 +234,59 @@ class DbtAdapter(Adapter):
         path: str | None,
         manifest_path: str | None = None,
     ) -> Iterable[ModelTarget]:  # type: ignore[override]
-        # Store project_dir for use in read_sql
-        self._project_dir = project_dir
-        # Use custom manifest path if provided
-        artifacts = load_artifacts(project_dir, manifest_path)
+        # Use custom manifest path if provided; cached for get_downstream_columns
+        artifacts = self._load(project_dir, manifest_path)
         if artifacts is None:
             return []
 
-        selected: list[DbtModel] = []
-        selected.extend(find_models_by_names(artifacts, models))
-        selected.extend(find_models_by_path(artifacts, path))
+        selected = find_models_by_names(artifacts, models) + find_models_by_path(artifacts, path)
+        return select_targets(selected, artifacts.models_by_name)
 
-        # If no specific selection, return all models
-        if not selected:
-            selected = list(artifacts.models_by_name.values())
-
-        # de-duplicate by name
-        seen: set[str] = set()
-        out: list[ModelTarget] = []
-        for m in selected:
-            if m.name in seen:
-                continue
-            seen.add(m.name)
-            out.append(ModelTarget(name=m.name, path=m.path))
-        return out
+    def affected_models(
+        self, project_dir: str, paths: Iterable[str], manifest_path: str | None = None
+    ) -> list[ModelTarget]:
+        self._load(project_dir, manifest_path)
+        return affected_targets(paths, self._models_by_path, self._models_by_id.get)
 
     def get_downstream_columns(self, project_dir, target):  # type: ignore[override]
-        artifacts = load_artifacts(project_dir)
-        if artifacts is None:
+        children = self._dependents(project_dir, target)
+        if children is None:
+            return {}
+
+        # Union the column usage of every direct dependent
+        ids = union(self._usage_ids(m) for m in children)
+        if not ids:
             return {}
+        # Unqualified scope expected by expander
+        return {"": self._symbols.decode(ids)}
 
-        # Collect SQL from simple downstream dependents (by name match in depends_on)
-        sql_texts: list[str] = []
-        target_models = [m for m in artifacts.models_by_name.values() if m.name == target.name]
-        target_ids = {m.node_id for m in target_models}
-        for m in artifacts.models_by_name.values():
-            if any(dep in target_ids for dep in m.depends_on):
-                if m.compiled_sql:
-                    sql_texts.append(m.compiled_sql)
-                elif m.raw_sql:
-                    sql_texts.append(m.raw_sql)
-
-        # Alias heuristics: allow empty alias set for now
-        cols = infer_downstream_columns(sql_texts, set())
-        # Map empty key to unqualified scope expected by expander
-        if "" in cols:
-            return {"": set(cols[""])}
-        return cols
+    def usage_fingerprint(self, project_dir, target):  # type: ignore[override]
+        children = self._dependents(project_dir, target)
+        if children is None:
+            return None
+
+        # Hash the dependents' SQL instead of parsing it
+        digest = hashlib.sha256()
+        for child in sorted(children, key=lambda m: m.node_id):
+            sql = self._analysis_sql(child)
+            if sql is None and child.node_id in self._usage:
+                return None  # text already released in low-memory mode
+            digest.update(f"{child.node_id}\0{sql or ''}\0".encode())
+        return digest.hexdigest()
 
     def read_sql(self, target: ModelTarget) -> str:  # pragma: no cover - placeholder
         # For dbt, read the raw SQL file (with Jinja templates)
         from ...core.io import read_text
 
-        # Check if file exists before trying to read it
-        if not os.path.exists(target.path):
+        # Let the open() fail instead of stat-ing first; one round trip per file
+        try:
+            return read_text(target.path)
+        except FileNotFoundError as exc:
             raise FileNotFoundError(
                 f"Model file not found: {target.path}\n"
                 f"This usually means the dbt manifest is out of sync with the actual files.\n"
                 f"Try running 'dbt compile' to regenerate the manifest."
-            )
-
-        return read_text(target.path)
+            ) from exc
 
     def write_sql(self, target: ModelTarget, sql: str) -> None:  # pragma: no cover
         from ...core.io import write_text
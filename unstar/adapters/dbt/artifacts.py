@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from ...core.io import existing_files
 
 
 @dataclass
@@ -19,6 +21,15 @@ class DbtModel:
 class DbtArtifacts:
     project_dir: str
     models_by_name: dict[str, DbtModel]
+    macros: dict[str, str] = field(default_factory=dict)  # name -> macro_sql
+
+
+def _warn_missing(locations: list[tuple[str, str]]) -> None:
+    # Debug: log path resolution for troubleshooting
+    found = existing_files(abs_path for abs_path, _ in locations)
+    for abs_path, rel_path in locations:
+        if abs_path not in found:
+            print(f"Warning: Model file not found: {abs_path} (from rel_path: {rel_path})")
 
 
 def _load_with_parser(
@@ -35,6 +46,7 @@ def _load_with_parser(
         return None
 
     models: dict[str, DbtModel] = {}
+    locations: list[tuple[str, str]] = []
     for node in manifest.nodes.values():
         if getattr(node, "resource_type", None) != "model":
             continue
@@ -42,10 +54,7 @@ def _load_with_parser(
         # file_path relative to project root - prefer original_file_path as it's more reliable
         rel_path = getattr(node, "original_file_path", None) or getattr(node, "path", None) or ""
         abs_path = os.path.abspath(os.path.join(project_dir, rel_path))
-
-        # Debug: log path resolution for troubleshooting
-        if not os.path.exists(abs_path):
-            print(f"Warning: Model file not found: {abs_path} (from rel_path: {rel_path})")
+        locations.append((abs_path, rel_path))
         depends = list(getattr(node, "depends_on", {}).get("nodes", []))
         models[name] = DbtModel(
             name=name,
@@ -58,28 +67,36 @@ def _load_with_parser(
             ),
         )
 
-    return DbtArtifacts(project_dir=project_dir, models_by_name=models)
+    macros: dict[str, str] = {}
+    for macro in getattr(manifest, "macros", {}).values():
+        name = getattr(macro, "name", None)
+        if name:
+            macros[name] = getattr(macro, "macro_sql", "")
+            macros[f"{getattr(macro, 'package_name', '')}.{name}"] = macros[name]
 
+    _warn_missing(locations)
+    return DbtArtifacts(project_dir=project_dir, models_by_name=models, macros=macros)
 
-def _load_raw_json(manifest_path: str, project_dir: str) -> DbtArtifacts:
+
+def _load_raw_json(manifest_path: str, project_dir: str, strict: bool = False) -> DbtArtifacts:
     try:
         with open(manifest_path, encoding="utf-8") as f:
             data = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
+    except (json.JSONDecodeError, FileNotFoundError) as exc:
+        if strict:
+            raise ValueError(f"cannot read manifest {manifest_path}: {exc}") from exc
         return DbtArtifacts(project_dir=project_dir, models_by_name={})
 
     nodes = data.get("nodes", {})
     models: dict[str, DbtModel] = {}
+    locations: list[tuple[str, str]] = []
     for node_id, node in nodes.items():
         if node.get("resource_type") != "model":
             continue
         name = node.get("name")
         rel_path = node.get("original_file_path") or node.get("path") or ""
         abs_path = os.path.abspath(os.path.join(project_dir, rel_path))
-
-        # Debug: log path resolution for troubleshooting
-        if not os.path.exists(abs_path):
-            print(f"Warning: Model file not found: {abs_path} (from rel_path: {rel_path})")
+        locations.append((abs_path, rel_path))
         depends = list(node.get("depends_on", {}).get("nodes", []))
         if name:
             models[name] = DbtModel(
@@ -91,12 +108,25 @@ def _load_raw_json(manifest_path: str, project_dir: str) -> DbtArtifacts:
                 compiled_sql=node.get("compiled_sql") or node.get("compiled_code"),
             )
 
-    return DbtArtifacts(project_dir=project_dir, models_by_name=models)
+    macros: dict[str, str] = {}
+    for macro in data.get("macros", {}).values():
+        name = macro.get("name")
+        if name:
+            macros[name] = macro.get("macro_sql", "")
+            macros[f"{macro.get('package_name', '')}.{name}"] = macros[name]
 
+    _warn_missing(locations)
+    return DbtArtifacts(project_dir=project_dir, models_by_name=models, macros=macros)
 
-def load_artifacts(project_dir: str, manifest_path: str | None = None) -> DbtArtifacts | None:
-    if manifest_path is None:
-        manifest_path = os.path.join(project_dir, "target", "manifest.json")
+
+def default_manifest_path(project_dir: str) -> str:
+    return os.path.join(project_dir, "target", "manifest.json")
+
+
+def parse_manifest(
+    project_dir: str, manifest_path: str, strict: bool = False
+) -> DbtArtifacts | None:
+    """Parse the manifest; ``strict`` raises ValueError when it is not valid JSON."""
 
     if not os.path.exists(manifest_path):
         return None
@@ -105,4 +135,30 @@ def load_artifacts(project_dir: str, manifest_path: str | None = None) -> DbtArt
     parsed = _load_with_parser(manifest_path, project_dir)
     if parsed is not None:
         return parsed
-    return _load_raw_json(manifest_path, project_dir)
+    return _load_raw_json(manifest_path, project_dir, strict)
+
+
+def load_artifacts(
+    project_dir: str, manifest_path: str | None = None, low_memory: bool = False
+) -> DbtArtifacts | None:
+    """Artifacts from the prebuilt index when fresh, else from the manifest.
+
+    With ``low_memory`` a missing or stale index is built first, in a child
+    process, so SQL text is only decoded for the models a run touches.
+    """
+
+    if manifest_path is None:
+        manifest_path = default_manifest_path(project_dir)
+
+    if not os.path.exists(manifest_path):
+        return None
+
+    # A fresh prebuilt index (`unstar index build`) avoids parsing the manifest
+    from .index import build_index_apart, open_index
+
+    indexed = open_index(project_dir, manifest_path)
+    if indexed is None and low_memory:
+        indexed = build_index_apart(project_dir, manifest_path)
+    if indexed is not None:
+        return indexed
+    return parse_manifest(project_dir, manifest_path)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import os
+
+from ...core.savings import RelationStats
+
+
+def default_catalog_path(manifest_path: str) -> str:
+    # dbt docs generate writes catalog.json next to manifest.json
+    return os.path.join(os.path.dirname(manifest_path), "catalog.json")
+
+
+def _num_bytes(stats: dict) -> int | None:
+    for key in ("num_bytes", "bytes", "size"):
+        stat = stats.get(key)
+        if isinstance(stat, dict) and stat.get("include", True):
+            try:
+                return int(float(stat["value"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+    return None
+
+
+def load_catalog(catalog_path: str) -> dict[str, RelationStats]:
+    """Map node/source unique ids to their column types and size from catalog.json."""
+
+    try:
+        with open(catalog_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    relations: dict[str, RelationStats] = {}
+    for section in ("nodes", "sources"):
+        for unique_id, entry in (data.get(section) or {}).items():
+            columns = {
+                (col.get("name") or name).lower(): col.get("type") or ""
+                for name, col in (entry.get("columns") or {}).items()
+            }
+            metadata = entry.get("metadata") or {}
+            relations[unique_id] = RelationStats(
+                name=metadata.get("name") or unique_id,
+                columns=columns,
+                num_bytes=_num_bytes(entry.get("stats") or {}),
+            )
+    return relations
@@ -0,0 +1,226 @@
+"""Prebuilt binary index of a dbt manifest (``unstar index build``).
+
+Layout: an 8-byte magic, format version and header length, a JSON header with
+the model and macro tables, then the raw and compiled SQL of every model
+concatenated. The file is memory-mapped read-only and SQL text is decoded only
+for the models a run actually touches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ...core.cache import cache_path, make_cache_dir
+from .artifacts import (
+    DbtArtifacts,
+    DbtModel,
+    _warn_missing,
+    default_manifest_path,
+    parse_manifest,
+)
+
+INDEX_FILE = "manifest.idx"
+INDEX_VERSION = 2
+MAGIC = b"UNSTARIX"
+_PREAMBLE = struct.Struct("<8sII")  # magic, version, header length
+
+_UNSET = object()
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _lazy_sql(field: str) -> property:
+    def get(self: IndexedDbtModel) -> str | None:
+        value = self._sql.get(field, _UNSET)
+        if value is _UNSET:
+            span = self._spans[field]
+            if span is None:
+                value = None
+            else:
+                start = self._base + span[0]
+                value = self._buf[start : start + span[1]].decode("utf-8")
+            self._sql[field] = value
+        return value
+
+    def set(self: IndexedDbtModel, value: str | None) -> None:
+        self._sql[field] = value
+
+    return property(get, set)
+
+
+class IndexedDbtModel(DbtModel):
+    """DbtModel whose SQL text is read from the mapped index on first access."""
+
+    raw_sql = _lazy_sql("raw_sql")  # type: ignore[assignment]
+    compiled_sql = _lazy_sql("compiled_sql")  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        depends_on: list[str],
+        node_id: str,
+        buf: mmap.mmap,
+        base: int,
+        spans: dict[str, list[int] | None],
+    ):
+        self.name = name
+        self.path = path
+        self.depends_on = depends_on
+        self.node_id = node_id
+        self._buf = buf
+        self._base = base
+        self._spans = spans
+        self._sql: dict[str, str | None] = {}
+
+
+def index_path(project_dir: str) -> str:
+    return cache_path(project_dir, INDEX_FILE)
+
+
+def build_index(project_dir: str, manifest_path: str | None = None) -> str:
+    """Compile the manifest's model table into the index file and return its path."""
+
+    manifest_path = manifest_path or default_manifest_path(project_dir)
+    artifacts = parse_manifest(project_dir, manifest_path)
+    if artifacts is None:
+        raise FileNotFoundError(f"manifest not found: {manifest_path}")
+
+    root = os.path.abspath(project_dir)
+    blob = bytearray()
+    records = []
+    for m in artifacts.models_by_name.values():
+        spans = []
+        for text in (m.raw_sql, m.compiled_sql):
+            if text is None:
+                spans.append(None)
+                continue
+            data = text.encode("utf-8")
+            spans.append([len(blob), len(data)])
+            blob += data
+        records.append([m.name, os.path.relpath(m.path, root), m.node_id, m.depends_on, *spans])
+
+    st = os.stat(manifest_path)
+    header = {
+        "manifest": os.path.abspath(manifest_path),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha256": _sha256(manifest_path),
+        "models": records,
+        "macros": artifacts.macros,
+    }
+    path = index_path(project_dir)
+    _write_index(path, header, blob)
+    return path
+
+
+def build_index_apart(project_dir: str, manifest_path: str) -> DbtArtifacts | None:
+    """Build the index in a child process and open it; None if that fails.
+
+    The parsed manifest then never lives in this process, so mapping the index
+    is the only cost of loading it here.
+    """
+
+    try:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(build_index, project_dir, manifest_path).result()
+    except (OSError, BrokenProcessPool):
+        return None  # e.g. unreadable manifest or read-only project
+    return open_index(project_dir, manifest_path)
+
+
+def _write_index(path: str, header: dict, blob: bytes | bytearray) -> None:
+    data = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    make_cache_dir(os.path.dirname(path))
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, INDEX_VERSION, len(data)))
+            f.write(data)
+            f.write(blob)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _fresh_header(buf: mmap.mmap, manifest_path: str) -> dict | None:
+    try:
+        magic, version, header_len = _PREAMBLE.unpack_from(buf, 0)
+        if magic != MAGIC or version != INDEX_VERSION:
+            return None
+        header = json.loads(buf[_PREAMBLE.size : _PREAMBLE.size + header_len])
+
+        if header["manifest"] != os.path.abspath(manifest_path):
+            return None
+        st = os.stat(manifest_path)
+        if (st.st_mtime_ns, st.st_size) != (header["mtime_ns"], header["size"]):
+            if st.st_size != header["size"] or _sha256(manifest_path) != header["sha256"]:
+                return None
+            # Same content under a new mtime (touch, identical dbt compile)
+            header["mtime_ns"] = st.st_mtime_ns
+            header["restamp"] = True
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    header["length"] = header_len
+    return header
+
+
+def open_index(project_dir: str, manifest_path: str) -> DbtArtifacts | None:
+    """Return artifacts from a fresh index, or None if missing or stale.
+
+    The index is stale when it was built from another manifest, or when the
+    manifest's mtime or size changed and its content hash no longer matches.
+    """
+
+    try:
+        with open(index_path(project_dir), "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    header = _fresh_header(buf, manifest_path)
+    if header is None:
+        buf.close()
+        return None
+    base = _PREAMBLE.size + header["length"]
+    if header.pop("restamp", False):
+        # Store the new mtime so later runs skip hashing the manifest again
+        stored = {k: v for k, v in header.items() if k != "length"}
+        try:
+            _write_index(index_path(project_dir), stored, buf[base:])
+        except OSError:
+            pass  # e.g. read-only project; the next run hashes again
+
+    root = os.path.abspath(project_dir)
+    models: dict[str, DbtModel] = {}
+    locations: list[tuple[str, str]] = []
+    for name, rel_path, node_id, depends, raw, compiled in header["models"]:
+        path = os.path.join(root, rel_path)
+        locations.append((path, rel_path))
+        models[name] = IndexedDbtModel(
+            name=name,
+            path=path,
+            depends_on=depends,
+            node_id=node_id,
+            buf=buf,
+            base=base,
+            spans={"raw_sql": raw, "compiled_sql": compiled},
+        )
+    _warn_missing(locations)
+    return DbtArtifacts(
+        project_dir=project_dir, models_by_name=models, macros=header.get("macros", {})
+    )
@@ -0,0 +1,195 @@
+"""Lightweight rendering of dbt Jinja for column analysis.
+
+Covers what most models use: ``ref``, ``source``, ``config``, ``var``, ``this``,
+``is_incremental()`` blocks (rendered as a full refresh) and calls to simple
+macros from the manifest. Other control tags are dropped while their body is
+kept once, and unknown expressions render as ``NULL`` so the result still parses.
+The output is only meant for finding referenced columns, not for execution.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+_TOKEN = re.compile(r"(\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\})", re.DOTALL)
+_CALL = re.compile(r"^([A-Za-z_][\w.]*)\s*\((.*)\)$", re.DOTALL)
+_NAME = re.compile(r"^[A-Za-z_]\w*$")
+_STRING = re.compile(r"""^(['"])(.*)\1$""", re.DOTALL)
+_MACRO = re.compile(
+    r"\{%-?\s*macro\s+(\w+)\s*\((.*?)\)\s*-?%\}(.*?)\{%-?\s*endmacro\s*-?%\}", re.DOTALL
+)
+
+# Nested macro expansion depth, guards against recursive macros
+_MAX_DEPTH = 5
+
+
+def _split_args(text: str) -> list[str]:
+    """Split call arguments on top-level commas."""
+
+    args: list[str] = []
+    depth = 0
+    quote = ""
+    current = ""
+    for ch in text:
+        if quote:
+            if ch == quote:
+                quote = ""
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            args.append(current.strip())
+            current = ""
+            continue
+        current += ch
+    if current.strip():
+        args.append(current.strip())
+    return args
+
+
+def _literal(text: str) -> str | None:
+    match = _STRING.match(text.strip())
+    return match.group(2) if match else None
+
+
+def _strip_delimiters(token: str) -> str:
+    return token[2:-2].strip("-").strip()
+
+
+def parse_macros(sources: dict[str, str]) -> dict[str, tuple[list[str], dict[str, str], str]]:
+    """Parse ``{name: macro_sql}`` into ``{name: (params, defaults, body)}``."""
+
+    macros: dict[str, tuple[list[str], dict[str, str], str]] = {}
+    for key, sql in sources.items():
+        match = _MACRO.search(sql or "")
+        if not match:
+            continue
+        params: list[str] = []
+        defaults: dict[str, str] = {}
+        for arg in _split_args(match.group(2)):
+            name, sep, default = arg.partition("=")
+            params.append(name.strip())
+            if sep:
+                defaults[name.strip()] = default.strip()
+        macros[key] = (params, defaults, match.group(3))
+    return macros
+
+
+class JinjaRenderer:
+    """Renders model templates, caching the output per model and source text."""
+
+    def __init__(
+        self, macros: dict[str, str] | None = None, variables: dict[str, str] | None = None
+    ):
+        self.macros = parse_macros(macros or {})
+        self.variables = variables or {}
+        self._cache: dict[tuple[str, str], str] = {}
+
+    def render_model(self, name: str, raw_sql: str) -> str:
+        key = (name, hashlib.sha1(raw_sql.encode("utf-8")).hexdigest())
+        rendered = self._cache.get(key)
+        if rendered is None:
+            rendered = self.render(raw_sql, {"this": name})
+            self._cache[key] = rendered
+        return rendered
+
+    def render(self, template: str, context: dict[str, str] | None = None, depth: int = 0) -> str:
+        context = context or {}
+        out: list[str] = []
+        # One entry per open block: whether its current branch is rendered
+        stack: list[bool] = []
+        # Per if-block: whether a branch has already been taken
+        taken: list[bool] = []
+
+        for token in _TOKEN.split(template):
+            if token.startswith("{#"):
+                continue
+            if token.startswith("{%"):
+                self._tag(_strip_delimiters(token), stack, taken)
+                continue
+            if not all(stack):
+                continue
+            if token.startswith("{{"):
+                out.append(self._expression(_strip_delimiters(token), context, depth))
+            else:
+                out.append(token)
+        return "".join(out)
+
+    def _tag(self, tag: str, stack: list[bool], taken: list[bool]) -> None:
+        keyword, _, rest = tag.replace("\n", " ").partition(" ")
+        if keyword == "if":
+            active = self._condition(rest)
+            stack.append(active)
+            taken.append(active)
+        elif keyword == "elif" and stack:
+            active = not taken[-1] and self._condition(rest.strip())
+            stack[-1] = active
+            taken[-1] = taken[-1] or active
+        elif keyword == "else" and stack:
+            stack[-1] = not taken[-1]
+            taken[-1] = True
+        elif keyword == "endif" and stack:
+            stack.pop()
+            taken.pop()
+        # for/set/call/filter and other tags: drop the tag, keep the body once
+
+    @staticmethod
+    def _condition(expr: str) -> bool:
+        expr = expr.strip()
+        if expr == "is_incremental()":
+            return False  # render as a full refresh
+        if expr == "not is_incremental()":
+            return True
+        # Unknown condition: keep the first branch
+        return True
+
+    def _expression(self, expr: str, context: dict[str, str], depth: int) -> str:
+        if expr in context:
+            return context[expr]
+        literal = _literal(expr)
+        if literal is not None:
+            return literal
+
+        call = _CALL.match(expr)
+        if call is None:
+            return "NULL"
+        func, args = call.group(1), _split_args(call.group(2))
+        strings = [s for s in (_literal(a) for a in args) if s is not None]
+
+        if func == "ref":
+            return strings[-1] if strings else "NULL"
+        if func == "source":
+            return ".".join(strings[:2]) if len(strings) >= 2 else "NULL"
+        if func == "config":
+            return ""
+        if func == "var":
+            if strings and strings[0] in self.variables:
+                return self.variables[strings[0]]
+            return args[1] if len(args) > 1 else "NULL"
+
+        macro = self.macros.get(func) or self.macros.get(func.rpartition(".")[2])
+        if macro is None or depth >= _MAX_DEPTH:
+            return "NULL"
+        params, defaults, body = macro
+        bound: dict[str, str] = {}
+        for i, arg in enumerate(args):
+            name, sep, value = arg.partition("=")
+            if sep and _NAME.match(name.strip()):
+                bound[name.strip()] = self._value(value, context)
+            elif i < len(params):
+                bound[params[i]] = self._value(arg, context)
+        for name, default in defaults.items():
+            bound.setdefault(name, self._value(default, context))
+        return self.render(body, {**context, **bound}, depth + 1).strip()
+
+    @staticmethod
+    def _value(text: str, context: dict[str, str]) -> str:
+        text = text.strip()
+        literal = _literal(text)
+        if literal is not None:
+            return literal
+        return context.get(text, text)
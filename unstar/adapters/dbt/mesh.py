@@ -0,0 +1,134 @@
+"""Cross-project (dbt mesh) consumers of a project's models.
+
+Other projects in a workspace can ``ref`` models of the project being expanded,
+so their models count as downstream dependents. The cross-project edges are
+cached per primary project; while no manifest changed, only the projects that
+actually hold consumers are loaded again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Sequence
+
+from ...core.cache import cache_path, load_json, save_json
+from ...core.schedule import parallel_map
+from .artifacts import DbtArtifacts, DbtModel, default_manifest_path, parse_manifest
+from .index import open_index
+
+EDGES_FILE = "mesh_edges.json"
+
+
+def read_workspace(path: str) -> list[tuple[str, str | None]]:
+    """Read ``{"projects": [{"project_dir": ..., "manifest": ...}]}``.
+
+    Relative paths are resolved against the workspace file's directory.
+    """
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    projects: list[tuple[str, str | None]] = []
+    for entry in data.get("projects", []):
+        project_dir = os.path.join(base, entry["project_dir"])
+        manifest = entry.get("manifest")
+        projects.append((project_dir, os.path.join(base, manifest) if manifest else None))
+    return projects
+
+
+def _fingerprint(manifest_path: str) -> list:
+    try:
+        st = os.stat(manifest_path)
+    except OSError:
+        return [os.path.abspath(manifest_path), None, None]
+    return [os.path.abspath(manifest_path), st.st_mtime_ns, st.st_size]
+
+
+def _digest(node_ids: set[str]) -> str:
+    return hashlib.sha256("\n".join(sorted(node_ids)).encode("utf-8")).hexdigest()
+
+
+def _parse_consumer(project: tuple[str, str]) -> DbtArtifacts | None:
+    return parse_manifest(*project, strict=True)
+
+
+def _load_all(
+    projects: Sequence[tuple[str, str]], indices: Sequence[int]
+) -> dict[int, DbtArtifacts]:
+    """Load the given projects' artifacts, from prebuilt indexes where fresh.
+
+    json.load holds the GIL, so the remaining manifests are parsed on processes.
+    Raises FileNotFoundError or ValueError when a manifest is missing or invalid:
+    dropping a consumer would make the expanded column lists too narrow for it.
+    """
+
+    loaded: dict[int, DbtArtifacts] = {}
+    unindexed: list[int] = []
+    for i in indices:
+        project_dir, manifest_path = projects[i]
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"manifest not found: {manifest_path}")
+        indexed = open_index(project_dir, manifest_path)
+        if indexed is not None:
+            loaded[i] = indexed
+        else:
+            unindexed.append(i)
+
+    jobs = min(len(unindexed), os.cpu_count() or 1, 8)
+    pending = [projects[i] for i in unindexed]
+    parsed = parallel_map(_parse_consumer, pending, jobs, size=lambda p: os.path.getsize(p[1]))
+    for i, artifacts in zip(unindexed, parsed):
+        if artifacts is None:
+            raise FileNotFoundError(f"manifest not found: {projects[i][1]}")
+        loaded[i] = artifacts
+    return loaded
+
+
+def cross_project_children(
+    primary: DbtArtifacts, extra_projects: Sequence[tuple[str, str | None]]
+) -> dict[str, list[DbtModel]]:
+    """Map node ids of ``primary``'s models to the models of other projects using them."""
+
+    if not extra_projects:
+        return {}
+
+    projects = [(d, m or default_manifest_path(d)) for d, m in extra_projects]
+    fingerprints = [_fingerprint(m) for _, m in projects]
+    own_ids = {m.node_id for m in primary.models_by_name.values()}
+
+    edges_path = cache_path(primary.project_dir, EDGES_FILE)
+    cached = load_json(edges_path)
+    if (
+        isinstance(cached, dict)
+        and cached.get("manifests") == fingerprints
+        and cached.get("targets") == _digest(own_ids)
+    ):
+        # edges: parent node id -> [[project index, child node id], ...]
+        edges: dict[str, list[list]] = cached["edges"]
+        needed = sorted({i for pairs in edges.values() for i, _ in pairs})
+        loaded = _load_all(projects, needed)
+    else:
+        loaded = _load_all(projects, range(len(projects)))
+        edges = {}
+        for i, artifacts in loaded.items():
+            for m in artifacts.models_by_name.values():
+                for dep in m.depends_on:
+                    if dep in own_ids and m.node_id not in own_ids:
+                        edges.setdefault(dep, []).append([i, m.node_id])
+        save_json(
+            edges_path, {"manifests": fingerprints, "targets": _digest(own_ids), "edges": edges}
+        )
+
+    by_id = {
+        i: {m.node_id: m for m in artifacts.models_by_name.values()}
+        for i, artifacts in loaded.items()
+    }
+    children: dict[str, list[DbtModel]] = {}
+    for parent, pairs in edges.items():
+        for i, child_id in pairs:
+            child = by_id.get(i, {}).get(child_id)
+            if child is not None:
+                children.setdefault(parent, []).append(child)
+    return children
@@ -0,0 +1,85 @@
+"""Settings read from ``dbt_project.yml``.
+
+PyYAML is used when installed (``pip install unstar[dbt]``); otherwise a small
+reader handles the ``name:`` line and a block-style ``vars:`` mapping, which is
+all the Jinja renderer needs.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+PROJECT_FILE = "dbt_project.yml"
+
+
+def _scalar(text: str) -> str:
+    text = text.split(" #", 1)[0].strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    return text
+
+
+def _read_simple(text: str) -> dict[str, Any]:
+    """Top-level scalars and the two-level ``vars:`` block of a YAML document."""
+
+    data: dict[str, Any] = {}
+    section: dict[str, Any] | None = None  # mapping under the current top-level key
+    scope: dict[str, Any] | None = None  # nested mapping, e.g. project-scoped vars
+    scope_indent = 0
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#") or stripped.startswith("- "):
+            continue
+        key, sep, value = stripped.partition(":")
+        if not sep:
+            continue
+        indent = len(line) - len(line.lstrip())
+        key, value = _scalar(key), _scalar(value)
+        if indent == 0:
+            section = scope = None
+            if value:
+                data[key] = value
+            else:
+                section = data.setdefault(key, {})
+        elif section is not None:
+            if scope is not None and indent > scope_indent:
+                scope[key] = value
+            elif value:
+                section[key], scope = value, None
+            else:
+                scope, scope_indent = section.setdefault(key, {}), indent
+    return data
+
+
+def read_project_vars(project_dir: str) -> dict[str, str]:
+    """``vars:`` of the project as strings; scoped ones for this project win."""
+
+    try:
+        with open(os.path.join(project_dir, PROJECT_FILE), encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return {}
+
+    try:
+        import yaml
+    except ImportError:
+        data = _read_simple(text)
+    else:
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError:
+            data = _read_simple(text)
+    if not isinstance(data, dict) or not isinstance(data.get("vars"), dict):
+        return {}
+
+    def text_of(value: Any) -> str:
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return str(value)
+
+    variables = {k: text_of(v) for k, v in data["vars"].items() if not isinstance(v, dict)}
+    scoped = data["vars"].get(data.get("name"))
+    if isinstance(scoped, dict):
+        variables.update({k: text_of(v) for k, v in scoped.items() if not isinstance(v, dict)})
+    return variables
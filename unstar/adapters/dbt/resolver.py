@@ -1,32 +1,20 @@
 from __future__ import annotations
 
-import os
 from collections.abc import Iterable
 
+from ...core import graph
 from .artifacts import DbtArtifacts, DbtModel
 
 
 def find_models_by_names(artifacts: DbtArtifacts, names: Iterable[str] | None) -> list[DbtModel]:
-    if not names:
-        return []
-    result: list[DbtModel] = []
-    for name in names:
-        model = artifacts.models_by_name.get(name)
-        if model:
-            result.append(model)
-    return result
+    return graph.find_by_names(artifacts.models_by_name, names)
 
 
 def find_models_by_path(artifacts: DbtArtifacts, base_path: str | None) -> list[DbtModel]:
-    if not base_path:
-        return []
-    abs_base = os.path.abspath(os.path.join(artifacts.project_dir, base_path))
-    out: list[DbtModel] = []
-    for m in artifacts.models_by_name.values():
-        try:
-            m_dir = os.path.dirname(m.path)
-            if os.path.commonpath([abs_base, m_dir]) == abs_base:
-                out.append(m)
-        except Exception:
-            continue
-    return out
+    return graph.find_by_path(artifacts.models_by_name, artifacts.project_dir, base_path)
+
+
+def build_child_index(artifacts: DbtArtifacts) -> dict[str, list[DbtModel]]:
+    """Map each node id to the models that depend on it."""
+
+    return graph.build_child_index(artifacts.models_by_name.values())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+from array import array
+from collections.abc import Iterable, Sequence
+
+from ...core.adapters import Adapter, ModelTarget, register_adapter
+from ...core.graph import (
+    affected_targets,
+    build_child_index,
+    fanout_cost,
+    find_by_names,
+    find_by_path,
+    select_targets,
+)
+from ...core.symbols import SymbolTable, union
+from .graph import SqlModel, SqlProject, load_project
+
+
+class SqlAdapter(Adapter):
+    """Adapter for plain directories of .sql files (raw views, SQLMesh models).
+
+    The dependency graph is built from FROM/JOIN references instead of a manifest.
+    """
+
+    def __init__(self):
+        self._project_dir = None
+        self._project: SqlProject | None = None
+        self._children: dict[str, list[SqlModel]] = {}
+        self._symbols = SymbolTable()
+        self._usage: dict[str, array] = {}
+        self._models_by_path: dict[str, SqlModel] = {}
+
+    def _load(self, project_dir: str) -> SqlProject:
+        if self._project is None or project_dir != self._project_dir:
+            self._project_dir = project_dir
+            self._project = load_project(project_dir, self.jobs)
+            self._children = build_child_index(self._project.models_by_name.values())
+            self._models_by_path = {m.path: m for m in self._project.models_by_name.values()}
+            self._usage = {}
+        return self._project
+
+    def _usage_ids(self, model: SqlModel) -> array:
+        ids = self._usage.get(model.name)
+        if ids is None:
+            ids = self._symbols.encode(model.columns)
+            self._usage[model.name] = ids
+        return ids
+
+    def detect(self, project_dir: str) -> bool:  # pragma: no cover - simple stub
+        return os.path.isdir(project_dir)
+
+    def list_models(
+        self,
+        project_dir: str,
+        models: Sequence[str] | None,
+        path: str | None,
+        manifest_path: str | None = None,
+    ) -> Iterable[ModelTarget]:  # type: ignore[override]
+        by_name = self._load(project_dir).models_by_name
+        selected = find_by_names(by_name, models) + find_by_path(by_name, project_dir, path)
+        return select_targets(selected, by_name)
+
+    def affected_models(
+        self, project_dir: str, paths: Iterable[str], manifest_path: str | None = None
+    ) -> list[ModelTarget]:
+        project = self._load(project_dir)
+        return affected_targets(paths, self._models_by_path, project.models_by_name.get)
+
+    def get_downstream_columns(self, project_dir, target):  # type: ignore[override]
+        self._load(project_dir)
+        ids = union(self._usage_ids(m) for m in self._children.get(target.name, ()))
+        if not ids:
+            return {}
+        return {"": self._symbols.decode(ids)}
+
+    def estimate_cost(self, target: ModelTarget) -> int:
+        model = self._project.models_by_name.get(target.name) if self._project else None
+        if model is None:
+            return super().estimate_cost(target)
+        return fanout_cost(model, self._children.get(model.name, ()), lambda m: m.size)
+
+    def read_sql(self, target: ModelTarget) -> str:
+        from ...core.io import read_text
+
+        return read_text(target.path)
+
+    def write_sql(self, target: ModelTarget, sql: str) -> None:  # pragma: no cover
+        from ...core.io import write_text
+
+        write_text(target.path, sql)
+
+
+register_adapter("sql", SqlAdapter())
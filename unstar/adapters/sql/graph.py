@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+from ...core.cache import cache_path, load_json, save_json
+from ...core.io import prefetch, read_text
+from ...core.schedule import parallel_map
+from ...core.sql import columns_in, parse_statements, tables_in
+
+INDEX_FILE = "sql_index.json"
+INDEX_VERSION = 1
+
+# Directories never scanned for models
+_SKIP_DIRS = {"target", "dbt_packages", "node_modules", "logs"}
+
+
+@dataclass
+class SqlModel:
+    name: str
+    path: str  # absolute path to .sql file
+    depends_on: list[str]  # names of models read in FROM/JOIN
+    columns: list[str]  # column identifiers referenced by this model
+    size: int = 0  # file size in bytes
+
+
+@dataclass
+class SqlProject:
+    project_dir: str
+    models_by_name: dict[str, SqlModel]
+
+
+def _scan(project_dir: str) -> dict[str, tuple[str, list[int]]]:
+    """Map relative path -> (absolute path, [mtime_ns, size]) for every .sql file."""
+
+    found: dict[str, tuple[str, list[int]]] = {}
+    root = os.path.abspath(project_dir)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in _SKIP_DIRS)
+        for filename in filenames:
+            if not filename.endswith(".sql"):
+                continue
+            abs_path = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(abs_path)
+            except OSError:
+                continue
+            rel = os.path.relpath(abs_path, root).replace(os.sep, "/")
+            found[rel] = (abs_path, [st.st_mtime_ns, st.st_size])
+    return found
+
+
+def _read(path: str) -> str | None:
+    try:
+        return read_text(path)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _parse(sql: str | None) -> tuple[list[str], list[str]]:
+    """Sorted tables and columns referenced by ``sql``."""
+
+    trees = parse_statements(sql) if sql else []
+    if not trees:
+        return [], []
+    return sorted(tables_in(trees)), sorted(columns_in(trees))
+
+
+def _parse_file(path: str) -> tuple[list[str], list[str]]:
+    return _parse(_read(path))
+
+
+def load_project(project_dir: str, jobs: int = 1) -> SqlProject:
+    """Discover models and their FROM/JOIN dependencies under ``project_dir``.
+
+    Per-file results are persisted to an index keyed by mtime and size, so only
+    new or modified files are read and parsed on later runs, on ``jobs``
+    processes when more than one.
+    """
+
+    index_path = cache_path(project_dir, INDEX_FILE)
+    index = load_json(index_path)
+    cached: dict[str, dict] = {}
+    if isinstance(index, dict) and index.get("version") == INDEX_VERSION:
+        cached = index.get("files", {})
+
+    files = _scan(project_dir)
+    entries: dict[str, dict] = {}
+    stale: list[str] = []
+    for rel, (_, stat) in files.items():
+        entry = cached.get(rel)
+        if entry is not None and entry.get("stat") == stat:
+            entries[rel] = entry
+        else:
+            stale.append(rel)
+
+    if jobs > 1 and len(stale) > 1:
+        paths = [files[rel][0] for rel in stale]
+        sizes = {files[rel][0]: files[rel][1][1] for rel in stale}
+        parsed = zip(stale, parallel_map(_parse_file, paths, jobs, size=sizes.__getitem__))
+    else:
+        parsed = (
+            (rel, _parse(pending.result()))
+            for rel, pending in prefetch(lambda r: _read(files[r][0]), stale)
+        )
+    for rel, (tables, columns) in parsed:
+        entries[rel] = {"stat": files[rel][1], "tables": tables, "columns": columns}
+
+    if stale or len(entries) != len(cached):
+        save_json(index_path, {"version": INDEX_VERSION, "files": entries})
+
+    # Model name is the file stem; references are matched case-insensitively
+    models: dict[str, SqlModel] = {}
+    for rel in sorted(entries):
+        name = os.path.splitext(os.path.basename(rel))[0]
+        if name in models:
+            print(f"Warning: duplicate model name '{name}' at {rel}; keeping {models[name].path}")
+            continue
+        models[name] = SqlModel(
+            name=name,
+            path=files[rel][0],
+            depends_on=[],
+            columns=entries[rel]["columns"],
+            size=files[rel][1][1],
+        )
+
+    by_lower = {name.lower(): name for name in models}
+    for rel, entry in entries.items():
+        name = os.path.splitext(os.path.basename(rel))[0]
+        model = models[name]
+        if model.path != files[rel][0]:
+            continue
+        deps = {by_lower.get(t.lower()) for t in entry["tables"]}
+        model.depends_on = sorted(d for d in deps if d and d != name)
+
+    return SqlProject(project_dir=project_dir, models_by_name=models)
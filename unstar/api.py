@@ -0,0 +1,381 @@
+"""Programmatic API for embedding unstar in long-lived processes.
+
+Example::
+
+    from unstar import Project
+
+    session = Project.open("path/to/dbt/project")
+    result = session.expand("users")
+    if result.changed:
+        print(result.new_sql)
+
+A session loads project artifacts once and reuses them, with their parse
+caches, across calls. Sessions are safe to share between threads.
+"""
+
+from __future__ import annotations
+
+import gc
+import importlib
+import json
+import os
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .core.adapters import Adapter, ModelTarget, get_adapter
+from .core.expander import expand_select_stars
+from .core.io import ensure_backup, prefetch, write_text
+from .core.memo import load_memo, memo_key, save_memo
+from .core.memory import current_rss, read_ahead
+from .core.savings import Savings, estimate_savings
+from .core.schedule import load_timings, save_timings
+
+# Number of model files read concurrently ahead of the target being expanded
+READ_AHEAD = 8
+
+# RSS growth in bytes over a memory budget before another full collection
+GC_GROWTH = 32 * 1024**2
+
+RESULTS_VERSION = 1
+
+
+class Cancelled(Exception):
+    """Raised by ``Session.expand_many`` when its cancel event is set."""
+
+
+@dataclass
+class ExpansionResult:
+    name: str
+    path: str  # absolute file path
+    original_sql: str
+    new_sql: str
+    columns: list[str]  # sorted downstream columns used for the expansion
+
+    @property
+    def changed(self) -> bool:
+        return self.new_sql != self.original_sql
+
+
+def dump_results(path: str, results: Iterable[ExpansionResult], **meta: Any) -> None:
+    """Write results to a JSON file that ``load_results`` (and ``unstar merge``) reads.
+
+    SQL text is only kept for changed models.
+    """
+
+    from . import __version__
+
+    records = []
+    for r in results:
+        record = asdict(r)
+        if not r.changed:
+            record.update(original_sql="", new_sql="")
+        records.append(record)
+    data = {"version": RESULTS_VERSION, "unstar": __version__, **meta, "results": records}
+    write_text(path, json.dumps(data, indent=1))
+
+
+def load_results(path: str) -> tuple[dict[str, Any], list[ExpansionResult]]:
+    """Return ``(metadata, results)`` from a file written by ``dump_results``."""
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results file version {data.get('version')!r}")
+    results = [ExpansionResult(**r) for r in data.pop("results")]
+    return data, results
+
+
+def _load_adapter(name: str) -> Adapter:
+    """Return a fresh adapter instance so sessions never share caches."""
+
+    # Ensure adapters are registered
+    if name in ("dbt", "sql"):
+        importlib.import_module(f".adapters.{name}", __package__)
+    return type(get_adapter(name))()
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+@dataclass(frozen=True)
+class Project:
+    project_dir: str
+    adapter: str = "dbt"
+    manifest_path: str | None = None
+    max_memory: int | None = None  # bytes; enables low-memory processing
+    # (project_dir, manifest_path) of other projects consuming this one (dbt mesh)
+    extra_projects: tuple[tuple[str, str | None], ...] = ()
+    memo: bool = True  # replay stored results of unchanged targets
+    jobs: int = 1  # processes for parsing; default for expand_many
+
+    @classmethod
+    def open(
+        cls,
+        project_dir: str = ".",
+        adapter: str = "dbt",
+        manifest_path: str | None = None,
+        max_memory: int | None = None,
+        extra_projects: Sequence[tuple[str, str | None]] = (),
+        memo: bool = True,
+        jobs: int = 1,
+    ) -> Session:
+        """Validate the project location and return a new session on it.
+
+        With ``max_memory`` the dbt manifest is loaded through its memory-mapped
+        index (built in a child process when missing), and the session evicts SQL
+        text and usage data as soon as ``expand_many`` no longer needs them.
+        Models of ``extra_projects`` count as downstream dependents (dbt only).
+        With ``memo`` off, every target is expanded again and no results are
+        stored in the project's ``.unstar`` directory. ``jobs`` processes parse
+        models while the project loads and in ``expand_many``.
+        """
+
+        if adapter == "dbt":
+            if not os.path.exists(os.path.join(project_dir, "dbt_project.yml")):
+                raise FileNotFoundError(
+                    f"no dbt project found at {project_dir}\n"
+                    "specify --project-dir or run from dbt project root"
+                )
+        elif not os.path.isdir(project_dir):
+            raise FileNotFoundError(f"project directory not found: {project_dir}")
+        if extra_projects and adapter != "dbt":
+            raise ValueError("additional projects are only supported by the dbt adapter")
+        if extra_projects:
+            from .adapters.dbt.artifacts import default_manifest_path
+
+            # A missing consumer would silently narrow the column lists
+            for extra_dir, extra_manifest in extra_projects:
+                if not os.path.exists(os.path.join(extra_dir, "dbt_project.yml")):
+                    raise FileNotFoundError(f"no dbt project found at {extra_dir}")
+                extra_manifest = extra_manifest or default_manifest_path(extra_dir)
+                if not os.path.isfile(extra_manifest):
+                    raise FileNotFoundError(f"manifest not found: {extra_manifest}")
+        return Session(
+            cls(project_dir, adapter, manifest_path, max_memory, tuple(extra_projects), memo, jobs)
+        )
+
+
+class Session:
+    """Expansion session over one project; see ``Project.open``."""
+
+    def __init__(self, project: Project):
+        self.project = project
+        self._lock = threading.RLock()
+        self._adapter = self._new_adapter()
+        self._targets: dict[str, ModelTarget] | None = None
+        # Seconds per dependent parsed in the last scheduled run
+        self.timings: dict[str, float] = {}
+        self._memo: dict[str, list] | None = None
+        self._memo_dirty = False
+
+    def _new_adapter(self) -> Adapter:
+        adapter = _load_adapter(self.project.adapter)
+        adapter.low_memory = self.project.max_memory is not None
+        adapter.extra_projects = self.project.extra_projects
+        adapter.jobs = self.project.jobs
+        return adapter
+
+    def reload(self) -> None:
+        """Drop loaded artifacts and caches, e.g. after the manifest was regenerated."""
+
+        with self._lock:
+            self._adapter = self._new_adapter()
+            self._targets = None
+
+    def models(self, select: Sequence[str] | None = None) -> list[ModelTarget]:
+        """Targets matching ``select`` (all models when empty), in project order."""
+
+        with self._lock:
+            return list(
+                self._adapter.list_models(
+                    self.project.project_dir, select or None, None, self.project.manifest_path
+                )
+            )
+
+    def affected(self, paths: Iterable[str]) -> list[ModelTarget]:
+        """Models to re-check when the files at ``paths`` changed (see ``core.git``)."""
+
+        with self._lock:
+            return self._adapter.affected_models(
+                self.project.project_dir, paths, self.project.manifest_path
+            )
+
+    def estimate_cost(self, model: str | ModelTarget) -> int:
+        """Relative cost of expanding ``model``; see ``core.shard.assign_shards``."""
+
+        target = self._target(model)
+        with self._lock:
+            return self._adapter.estimate_cost(target)
+
+    def _target(self, model: str | ModelTarget) -> ModelTarget:
+        if isinstance(model, ModelTarget):
+            return model
+        with self._lock:
+            if self._targets is None:
+                self._targets = {t.name: t for t in self.models()}
+            try:
+                return self._targets[model]
+            except KeyError:
+                raise KeyError(f"Unknown model '{model}'") from None
+
+    def _memo_key(self, target: ModelTarget, original_sql: str) -> tuple[str, dict | None]:
+        """Result store key of ``target``, and its scope if that had to be computed."""
+
+        from . import __version__
+
+        project_dir = self.project.project_dir
+        scope = None
+        with self._lock:
+            usage = self._adapter.usage_fingerprint(project_dir, target)
+            if usage is None:
+                scope = self._adapter.get_downstream_columns(project_dir, target)
+                usage = json.dumps(scope.get("", []))
+        return memo_key(original_sql, usage, __version__), scope
+
+    def _stored(self, target: ModelTarget, key: str) -> list | None:
+        with self._lock:
+            if self._memo is None:
+                self._memo = load_memo(self.project.project_dir)
+            entry = self._memo.get(target.name)
+        return entry if entry is not None and entry[0] == key else None
+
+    def _expand(self, target: ModelTarget, original_sql: str) -> ExpansionResult:
+        key = scope = None
+        if self.project.memo:
+            key, scope = self._memo_key(target, original_sql)
+            entry = self._stored(target, key)
+            if entry is not None:
+                # Same SQL, same downstream usage: replay the stored verdict
+                _, columns, new_sql = entry
+                return ExpansionResult(
+                    name=target.name,
+                    path=target.path,
+                    original_sql=original_sql,
+                    new_sql=original_sql if new_sql is None else new_sql,
+                    columns=columns,
+                )
+
+        if scope is None:
+            with self._lock:
+                scope = self._adapter.get_downstream_columns(self.project.project_dir, target)
+        result = ExpansionResult(
+            name=target.name,
+            path=target.path,
+            original_sql=original_sql,
+            new_sql=expand_select_stars(original_sql, scope),
+            columns=scope.get("", []),
+        )
+        if key is not None:
+            with self._lock:
+                self._memo[target.name] = [  # type: ignore[index]
+                    key,
+                    result.columns,
+                    result.new_sql if result.changed else None,
+                ]
+                self._memo_dirty = True
+        return result
+
+    def _unstored(self, targets: Sequence[ModelTarget]) -> list[ModelTarget]:
+        """Targets without a stored result for their current inputs."""
+
+        if not self.project.memo:
+            return list(targets)
+        missing: list[ModelTarget] = []
+        for target, pending_sql in prefetch(self._adapter.read_sql, targets, READ_AHEAD):
+            try:
+                key, _ = self._memo_key(target, pending_sql.result())
+            except OSError:
+                key = None  # reported when the target itself is expanded
+            if key is None or self._stored(target, key) is None:
+                missing.append(target)
+        return missing
+
+    def expand(self, model: str | ModelTarget) -> ExpansionResult:
+        target = self._target(model)
+        result = self._expand(target, self._adapter.read_sql(target))
+        self.save()
+        return result
+
+    def expand_many(
+        self,
+        models: Iterable[str | ModelTarget] | None = None,
+        cancel: threading.Event | None = None,
+        jobs: int | None = None,
+    ) -> Iterator[ExpansionResult]:
+        """Yield results in order; all models when ``models`` is None.
+
+        Model files are read ahead concurrently. Setting ``cancel`` stops the run
+        before the next target with ``Cancelled``.
+
+        With ``jobs > 1`` dependents of targets without a stored result are parsed
+        up front on ``jobs`` processes, longest first by the parse times measured
+        in earlier runs; this run's times are stored for the next one. Under a
+        memory budget, targets sharing dependents are processed together, cached
+        state is released after each one, which changes the result order, and
+        fewer files are read ahead when they are large relative to the budget.
+        """
+
+        targets = self.models() if models is None else [self._target(m) for m in models]
+        jobs = self.project.jobs if jobs is None else jobs
+        project_dir = self.project.project_dir
+        if jobs > 1:
+            stale = self._unstored(targets)
+            with self._lock:
+                self.timings = self._adapter.warm(stale, jobs, load_timings(project_dir))
+
+        budget = self.project.max_memory
+        depth = READ_AHEAD
+        if budget is not None:
+            with self._lock:
+                targets = self._adapter.local_order(targets)
+            depth = read_ahead(budget, (_file_size(t.path) for t in targets), READ_AHEAD)
+        collected_at = 0  # RSS after the last forced collection
+
+        for target, pending_sql in prefetch(self._adapter.read_sql, targets, depth):
+            if cancel is not None and cancel.is_set():
+                raise Cancelled(f"cancelled before {target.name}")
+            result = self._expand(target, pending_sql.result())
+            if budget is not None:
+                with self._lock:
+                    self._adapter.release(target)
+                # Freed memory is rarely returned to the OS, so only collect
+                # again once RSS has grown noticeably since the last collection
+                rss = current_rss()
+                if rss is not None and rss > max(budget, collected_at + GC_GROWTH):
+                    gc.collect()
+                    collected_at = current_rss() or rss
+            yield result
+
+        if jobs > 1:
+            save_timings(project_dir, self.timings)
+        self.save()
+
+    def save(self) -> None:
+        """Store results for replay in later runs; ``expand`` and ``expand_many`` call this."""
+
+        with self._lock:
+            if self._memo is not None and self._memo_dirty:
+                save_memo(self.project.project_dir, self._memo)
+                self._memo_dirty = False
+
+    def savings(self, result: ExpansionResult) -> Savings:
+        """Estimate scan reduction of ``result`` from local catalog metadata."""
+
+        target = ModelTarget(name=result.name, path=result.path)
+        with self._lock:
+            relations = self._adapter.upstream_relations(target)
+        return estimate_savings(result.name, result.path, result.columns, relations)
+
+    def write(self, result: ExpansionResult, backup: bool = False) -> None:
+        """Write ``result.new_sql`` back to the model file."""
+
+        if backup:
+            ensure_backup(result.path)
+        with self._lock:
+            self._adapter.write_sql(ModelTarget(name=result.name, path=result.path), result.new_sql)
@@ -6,28 +6,72 @@ import sys
 from collections.abc import Sequence
 
 from . import __version__
-from .core.adapters import get_adapter
-from .core.expander import expand_select_stars
-from .core.io import ensure_backup, unified_diff, write_text
+from .api import ExpansionResult, Project, Session, dump_results, load_results
+from .core.adapters import ModelTarget
+from .core.git import changed_files
+from .core.io import unified_diff, write_text
+from .core.memory import format_size, parse_size, peak_rss
+from .core.savings import Savings, format_bytes, rank
+from .core.shard import assign_shards, parse_shard
+
+REPORTERS = ["human", "diff", "github"]
 
 
 def _build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(prog="unstar", description="Expand SELECT * safely")
+    parser = argparse.ArgumentParser(
+        prog="unstar",
+        description="Expand SELECT * safely",
+        epilog="Other commands: 'unstar merge FILE...' combines --results-file outputs of "
+        "sharded runs; 'unstar index build' prebuilds a dbt project index.",
+    )
     parser.add_argument("-V", "--version", action="version", version=__version__)
 
     # Simplified selection - just use --select like dbt
     parser.add_argument("--select", nargs="*", help="Models/files to process")
 
+    # Restrict to models touched by git changes
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only models in files changed since REF (including uncommitted), and their parents",
+    )
+    changes.add_argument(
+        "--staged",
+        action="store_true",
+        help="Only models in files staged for commit, and their parents",
+    )
+
     # Adapter selection
     parser.add_argument(
-        "--adapter", choices=["dbt"], default="dbt", help="Adapter to use (default: dbt)"
+        "--adapter",
+        choices=["dbt", "sql"],
+        default="dbt",
+        help="Adapter to use: dbt project or plain directory of .sql files (default: dbt)",
     )
 
-    # Project directory
-    parser.add_argument("--project-dir", default=".", help="Project root directory (default: .)")
+    # Project directory; repeat with --manifest for downstream projects (dbt mesh)
+    parser.add_argument(
+        "--project-dir",
+        action="append",
+        help="Project root directory (default: .). Repeat to add downstream dbt projects "
+        "whose models consume the first one",
+    )
 
     # dbt-specific options
-    parser.add_argument("--manifest", help="Custom path to dbt manifest.json (dbt adapter only)")
+    parser.add_argument(
+        "--manifest",
+        action="append",
+        help="Custom path to dbt manifest.json (dbt adapter only), paired with --project-dir "
+        "in order",
+    )
+    parser.add_argument(
+        "--workspace",
+        metavar="FILE",
+        help="JSON file listing dbt projects as "
+        '{"projects": [{"project_dir": ..., "manifest": ...}]}; the first is expanded '
+        "unless --project-dir is given",
+    )
 
     # Output modes
     modes = parser.add_mutually_exclusive_group()
@@ -40,15 +84,48 @@ def _build_parser() -> argparse.ArgumentParser:
     # Reporter options for dry-run
     parser.add_argument(
         "--reporter",
-        choices=["human", "diff", "github"],
+        choices=[*REPORTERS, "savings"],
         default="human",
         help="Output format for dry-run (default: human)",
     )
 
+    parser.add_argument(
+        "--max-memory",
+        type=parse_size,
+        metavar="SIZE",
+        help="Memory budget such as 512M or 4G: evict cached SQL as targets complete "
+        "and report peak RSS at exit",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse downstream models on N processes and schedule targets by cost (default: 1)",
+    )
+
+    # Sharding across CI nodes
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="INDEX/COUNT",
+        help="Process only shard INDEX of COUNT (1-based), balanced by estimated cost",
+    )
+    parser.add_argument(
+        "--results-file", metavar="PATH", help="Write results as JSON for 'unstar merge'"
+    )
+
     # Other options
     parser.add_argument(
         "--backup", action="store_true", default=False, help="Create .bak files when writing"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Expand every model again instead of replaying stored results, and store none",
+    )
     parser.add_argument(
         "--verbose", action="store_true", default=False, help="Show detailed output"
     )
@@ -56,85 +133,277 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    if argv is None:
-        argv = sys.argv[1:]
+def _build_merge_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="unstar merge", description="Combine shard result files into one report"
+    )
+    parser.add_argument("files", nargs="+", help="Files written with --results-file")
+    parser.add_argument(
+        "--reporter",
+        choices=REPORTERS,
+        default="human",
+        help="Output format (default: human)",
+    )
+    return parser
 
-    parser = _build_parser()
-    args = parser.parse_args(list(argv))
 
-    # Ensure adapters are registered
-    if args.adapter == "dbt":
-        from .adapters import dbt as _  # noqa: F401
+def _build_index_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="unstar index", description="Manage the prebuilt dbt project index"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser(
+        "build", help="Compile manifest.json into a binary index for fast startup"
+    )
+    build.add_argument("--project-dir", default=".", help="Project root directory (default: .)")
+    build.add_argument("--manifest", help="Custom path to dbt manifest.json")
+    return parser
 
-    adapter = get_adapter(args.adapter)
 
-    # Use project directory from args
-    project_dir = args.project_dir
-    if args.adapter == "dbt":
-        # Check if dbt_project.yml exists in the specified directory
-        dbt_project_path = os.path.join(project_dir, "dbt_project.yml")
-        if not os.path.exists(dbt_project_path):
-            print(f"unstar: no dbt project found at {project_dir}")
-            print("unstar: specify --project-dir or run from dbt project root")
+def _report(result: ExpansionResult, reporter: str) -> None:
+    if reporter == "diff":
+        diff = unified_diff(result.path, result.original_sql, result.path, result.new_sql)
+        print(diff)
+    elif reporter == "github":
+        # GitHub Actions format
+        print(f"::warning file={result.path}::SELECT * can be expanded to explicit columns")
+    elif reporter == "human":
+        # Human-readable format - simple one line
+        if result.columns:
+            print(f"Model {result.name}: SELECT * → {', '.join(result.columns)}")
+        else:
+            print(f"Model {result.name}: No downstream columns found")
+
+
+def _report_savings(savings: list[Savings], project_dir: str) -> None:
+    """Print models ranked by estimated scan reduction, then the project total."""
+
+    def scanned(pruned: int | None, total: int | None) -> str:
+        if total is None:
+            return "scan size unknown"
+        return f"~{format_bytes(pruned or 0)} of {format_bytes(total)} scanned"
+
+    for s in rank(savings):
+        rel = os.path.relpath(s.path, start=project_dir)
+        if not s.total_columns:
+            print(f"{s.name} ({rel}): expands to {s.kept_columns} columns, no catalog data")
+            continue
+        print(
+            f"{s.name} ({rel}): prune {s.pruned_columns} of {s.total_columns} columns, "
+            f"{scanned(s.pruned_bytes, s.scanned_bytes)}"
+        )
+
+    known = [s for s in savings if s.total_columns]
+    sized = [s for s in known if s.scanned_bytes is not None]
+    pruned_bytes = sum(s.pruned_bytes or 0 for s in sized) if sized else None
+    scanned_bytes = sum(s.scanned_bytes or 0 for s in sized) if sized else None
+    total = f"Total: {len(savings)} models"
+    if known:
+        total += (
+            f", prune {sum(s.pruned_columns for s in known)} of "
+            f"{sum(s.total_columns for s in known)} columns, {scanned(pruned_bytes, scanned_bytes)}"
+        )
+    missing = len(savings) - len(known)
+    if missing:
+        total += f"; {missing} without catalog data (see 'dbt docs generate')"
+    print(total)
+
+
+def _merge(argv: list[str]) -> int:
+    args = _build_merge_parser().parse_args(argv)
+
+    results: list[ExpansionResult] = []
+    counts: set[int] = set()
+    indices: set[int] = set()
+    unsharded = 0
+    for path in args.files:
+        try:
+            meta, partial = load_results(path)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            print(f"unstar: cannot read results file {path}: {exc}")
+            return 2
+        if meta.get("shard"):
+            index, count = meta["shard"]
+            if index in indices:
+                print(f"unstar: results for shard {index} given more than once")
+                return 2
+            indices.add(index)
+            counts.add(count)
+        else:
+            unsharded += 1
+        results.extend(partial)
+
+    if unsharded and len(args.files) > 1:
+        print("unstar: results of an unsharded run cannot be merged with other files")
+        return 2
+    if len(counts) > 1:
+        print("unstar: results files come from runs with different shard counts")
+        return 2
+    if counts:
+        missing = sorted(set(range(1, counts.pop() + 1)) - indices)
+        if missing:
+            print(f"unstar: missing results for shard(s) {', '.join(map(str, missing))}")
             return 2
 
-    # Handle --select argument (dbt models)
-    if args.select:
-        targets = list(adapter.list_models(project_dir, args.select, None, args.manifest))
-    else:
-        # No selection = process all models
-        targets = list(adapter.list_models(project_dir, None, None, args.manifest))
+    changes_detected = False
+    for result in sorted(results, key=lambda r: r.path):
+        if result.changed:
+            changes_detected = True
+            _report(result, args.reporter)
+    return 1 if changes_detected else 0
+
+
+def _index(argv: list[str]) -> int:
+    args = _build_index_parser().parse_args(argv)
+
+    from .adapters.dbt.index import build_index
+
+    try:
+        path = build_index(args.project_dir, args.manifest)
+    except OSError as exc:
+        print(f"unstar: {exc}")
+        return 2
+    print(f"unstar: wrote index {path}")
+    return 0
+
+
+def _select_targets(
+    session: Session, project_dir: str, args: argparse.Namespace
+) -> list[ModelTarget]:
+    if args.changed_since or args.staged:
+        paths = changed_files(project_dir, args.changed_since, args.staged)
+        targets = session.affected(paths)
+        if args.select:
+            selected = {t.name for t in session.models(args.select)}
+            targets = [t for t in targets if t.name in selected]
+        return targets
+    # No selection = process all models
+    return session.models(args.select)
+
+
+def _resolve_projects(args: argparse.Namespace) -> list[tuple[str, str | None]]:
+    """(project_dir, manifest) pairs; the first is the project being expanded."""
+
+    dirs = args.project_dir or []
+    manifests = args.manifest or []
+    projects: list[tuple[str, str | None]] = [
+        (d, manifests[i] if i < len(manifests) else None) for i, d in enumerate(dirs)
+    ]
+    if not dirs and len(manifests) == 1:
+        projects.append((".", manifests[0]))
+
+    if args.workspace:
+        from .adapters.dbt.mesh import read_workspace
+
+        seen = {os.path.abspath(d) for d, _ in projects}
+        for project_dir, manifest in read_workspace(args.workspace):
+            if os.path.abspath(project_dir) not in seen:
+                seen.add(os.path.abspath(project_dir))
+                projects.append((project_dir, manifest))
+    return projects or [(".", None)]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["merge"]:
+        return _merge(argv[1:])
+    if argv[:1] == ["index"]:
+        return _index(argv[1:])
 
-    if not targets:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    # Use project directory from args
+    try:
+        projects = _resolve_projects(args)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"unstar: cannot read workspace {args.workspace}: {exc}")
+        return 2
+    if len(args.manifest or []) > max(1, len(args.project_dir or [])):
+        print("unstar: more --manifest than --project-dir options")
+        return 2
+
+    (project_dir, manifest), extra_projects = projects[0], projects[1:]
+    try:
+        session = Project.open(
+            project_dir,
+            args.adapter,
+            manifest,
+            args.max_memory,
+            extra_projects,
+            memo=not args.no_cache,
+            jobs=args.jobs,
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        for line in str(exc).splitlines():
+            print(f"unstar: {line}")
+        return 2
+
+    try:
+        targets = _select_targets(session, project_dir, args)
+    except (RuntimeError, FileNotFoundError, ValueError) as exc:
+        print(f"unstar: {exc}")
+        return 2
+
+    if args.shard:
+        index, count = args.shard
+        targets = assign_shards(targets, count, session.estimate_cost)[index - 1]
+
+    if not targets and not args.results_file:
         print("unstar: no models selected")
         return 0
 
     exit_code = 0
     changes_detected = False
-
-    for t in targets:
-        original_sql = adapter.read_sql(t)
-
-        scope = adapter.get_downstream_columns(project_dir, t)
-        new_sql = expand_select_stars(original_sql, scope)
-
-        if new_sql == original_sql:
+    recorded: list[ExpansionResult] = []
+    savings: list[Savings] = []
+
+    for result in session.expand_many(targets, jobs=args.jobs):
+        if args.results_file:
+            # Only changed results need their SQL for re-reporting
+            recorded.append(
+                result
+                if result.changed
+                else ExpansionResult(result.name, result.path, "", "", result.columns)
+            )
+
+        if not result.changed:
             continue
 
         changes_detected = True
 
         if args.dry_run:
-            if args.reporter == "diff":
-                diff = unified_diff(t.path, original_sql, t.path, new_sql)
-                print(diff)
-            elif args.reporter == "github":
-                # GitHub Actions format
-                print(f"::warning file={t.path}::SELECT * can be expanded to explicit columns")
-            elif args.reporter == "human":
-                # Human-readable format - simple one line
-                columns = sorted(scope.get("", set()))
-                if columns:
-                    print(f"Model {t.name}: SELECT * → {', '.join(columns)}")
-                else:
-                    print(f"Model {t.name}: No downstream columns found")
+            if args.reporter == "savings":
+                savings.append(session.savings(result))
+            else:
+                _report(result, args.reporter)
             continue
 
         if args.output:
-            rel = os.path.relpath(t.path, start=project_dir)
+            rel = os.path.relpath(result.path, start=project_dir)
             dest = os.path.join(args.output, rel)
-            write_text(dest, new_sql)
+            write_text(dest, result.new_sql)
             continue
 
         if args.write:
-            if args.backup:
-                ensure_backup(t.path)
-            adapter.write_sql(t, new_sql)
+            session.write(result, backup=args.backup)
             continue
 
         # Default when no mode provided: dry-run
-        diff = unified_diff(t.path, original_sql, t.path, new_sql)
-        print(diff)
+        _report(result, "diff")
+
+    if savings:
+        _report_savings(savings, project_dir)
+
+    if args.results_file:
+        dump_results(args.results_file, recorded, shard=list(args.shard) if args.shard else None)
+
+    if args.max_memory is not None or args.verbose:
+        peak = peak_rss()
+        if peak is not None:
+            over = args.max_memory is not None and peak > args.max_memory
+            note = " (over --max-memory budget)" if over else ""
+            print(f"unstar: peak RSS {format_size(peak)}{note}", file=sys.stderr)
 
     # Return 1 if changes were detected in dry-run mode (for CI/linting)
     if args.dry_run and changes_detected:
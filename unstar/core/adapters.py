@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 
+from .savings import RelationStats
+
 
 @dataclass
 class ModelTarget:
@@ -18,6 +21,17 @@ class Adapter:
     Concrete adapters must implement all abstract methods below.
     """
 
+    # When set, adapters drop cached SQL and usage data as soon as it is no
+    # longer needed, trading re-use across calls for a lower memory peak.
+    low_memory = False
+
+    # Other (project_dir, manifest_path) pairs whose models may consume this
+    # project's models, e.g. downstream projects in a dbt mesh.
+    extra_projects: Sequence[tuple[str, str | None]] = ()
+
+    # Processes available for parsing while the project is loaded
+    jobs = 1
+
     def detect(self, project_dir: str) -> bool:
         raise NotImplementedError
 
@@ -26,8 +40,19 @@ class Adapter:
     ) -> Iterable[ModelTarget]:
         raise NotImplementedError
 
-    def get_downstream_columns(self, project_dir: str, target: ModelTarget) -> dict[str, set[str]]:
-        """Return mapping alias/table -> set of referenced columns in downstream nodes."""
+    def affected_models(
+        self, project_dir: str, paths: Iterable[str], manifest_path: str | None = None
+    ) -> list[ModelTarget]:
+        """Models whose expansion may change when the files at ``paths`` change.
+
+        That is the models defined in those files plus the models they read from,
+        whose downstream column usage depends on them.
+        """
+
+        raise NotImplementedError
+
+    def get_downstream_columns(self, project_dir: str, target: ModelTarget) -> dict[str, list[str]]:
+        """Return mapping alias/table -> sorted columns referenced in downstream nodes."""
 
         raise NotImplementedError
 
@@ -37,6 +62,50 @@ class Adapter:
     def write_sql(self, target: ModelTarget, sql: str) -> None:
         raise NotImplementedError
 
+    def estimate_cost(self, target: ModelTarget) -> int:
+        """Relative cost of expanding ``target``, used to balance shards."""
+
+        try:
+            return os.path.getsize(target.path) + 1
+        except OSError:
+            return 1
+
+    def usage_fingerprint(self, project_dir: str, target: ModelTarget) -> str | None:
+        """Cheap digest of what determines ``target``'s downstream columns.
+
+        None means unknown; the columns themselves are used instead.
+        """
+
+        return None
+
+    def upstream_relations(self, target: ModelTarget) -> list[RelationStats]:
+        """Relations a ``SELECT *`` in ``target`` reads, with column types and size."""
+
+        return []
+
+    def local_order(self, targets: Sequence[ModelTarget]) -> list[ModelTarget]:
+        """Reorder targets so ones sharing downstream dependents run together.
+
+        Called once per bounded run with all of its targets; ``release`` frees
+        shared state only after every one of them that needs it has run.
+        """
+
+        return list(targets)
+
+    def warm(
+        self, targets: Sequence[ModelTarget], jobs: int, history: dict[str, float] | None = None
+    ) -> dict[str, float]:
+        """Precompute cached usage for the targets' dependents on ``jobs`` processes.
+
+        Work is dispatched longest first using seconds measured in earlier runs
+        (``history``); returns this run's measurements, keyed the same way.
+        """
+
+        return {}
+
+    def release(self, target: ModelTarget) -> None:
+        """Drop cached state that only ``target`` still needed (low-memory mode)."""
+
 
 _ADAPTERS: dict[str, Adapter] = {}
 
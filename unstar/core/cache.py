@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Any
+
+# Per-project directory holding indexes and caches between runs
+CACHE_DIR = ".unstar"
+
+
+def cache_path(project_dir: str, name: str) -> str:
+    return os.path.join(project_dir, CACHE_DIR, name)
+
+
+def make_cache_dir(directory: str) -> None:
+    """Create ``directory`` with a ``.gitignore`` so git never picks up its files."""
+
+    os.makedirs(directory, exist_ok=True)
+    ignore = os.path.join(directory, ".gitignore")
+    if not os.path.exists(ignore):
+        with open(ignore, "w", encoding="utf-8") as f:
+            f.write("# Created by unstar\n*\n")
+
+
+def load_json(path: str) -> Any | None:
+    """Return the decoded cache file, or None if it is missing or unreadable."""
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_json(path: str, data: Any) -> None:
+    """Write ``data`` atomically so concurrent runs never see a partial file."""
+
+    tmp = None
+    try:
+        make_cache_dir(os.path.dirname(path))
+        # Unique per writer, also between sessions of one process
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        # Caches are an optimization; a read-only project must still work
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+
+from .symbols import merge_unique
+
 
 class ExpansionWarning(Exception):
     pass
 
 
-def expand_select_stars(sql: str, scope_columns: dict[str, set[str]]) -> str:
+def expand_select_stars(sql: str, scope_columns: Mapping[str, Sequence[str]]) -> str:
     """Expand SELECT * and qualifier.* using provided column scope.
 
-    - scope_columns maps alias/table identifier -> set of column names
+    - scope_columns maps alias/table identifier -> sorted column names
     - unqualified * expands to union of all columns in scope
     - qualified a.* expands to columns from that qualifier only
     - if no columns available for a star, leaves it unchanged
@@ -17,9 +21,7 @@ def expand_select_stars(sql: str, scope_columns: dict[str, set[str]]) -> str:
     import re
 
     # Get all available columns
-    all_cols = set()
-    for cols in scope_columns.values():
-        all_cols.update(cols)
+    all_cols = list(merge_unique(scope_columns.values()))
 
     if not all_cols:
         return sql
@@ -31,7 +33,7 @@ def expand_select_stars(sql: str, scope_columns: dict[str, set[str]]) -> str:
         # Get the rest of the line after SELECT *
         rest_of_line = match.group(2).lstrip()
         # Replace with explicit columns, maintaining indentation
-        cols_str = ",\n".join(f"{indent}    {col}" for col in sorted(all_cols))
+        cols_str = ",\n".join(f"{indent}    {col}" for col in all_cols)
         if rest_of_line:
             return f"select\n{cols_str}\n{indent}{rest_of_line}"
         else:
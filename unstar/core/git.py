@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+import subprocess
+
+
+def _git(project_dir: str, *args: str) -> list[str]:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", project_dir, *args], capture_output=True, text=True, check=False
+        )
+    except OSError as exc:
+        raise RuntimeError(f"cannot run git: {exc}") from exc
+    if proc.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {proc.stderr.strip()}")
+    return [p for p in proc.stdout.split("\0") if p]
+
+
+def changed_files(project_dir: str, ref: str | None = None, staged: bool = False) -> list[str]:
+    """Absolute paths under ``project_dir`` changed according to git.
+
+    With ``staged`` only the index is compared to HEAD. Otherwise the working
+    tree is compared to ``ref`` (default HEAD), and untracked files are included.
+    """
+
+    if staged:
+        rel = _git(project_dir, "diff", "--name-only", "-z", "--relative", "--cached")
+    else:
+        rel = _git(project_dir, "diff", "--name-only", "-z", "--relative", ref or "HEAD", "--")
+        rel += _git(project_dir, "ls-files", "-z", "--others", "--exclude-standard")
+    return sorted({os.path.abspath(os.path.join(project_dir, p)) for p in rel})
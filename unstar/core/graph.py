@@ -0,0 +1,99 @@
+"""Model graph operations shared by adapters.
+
+Adapters keep their own model types (dbt nodes, plain .sql files); anything
+with a ``name``, an absolute ``path`` and ``depends_on`` keys works here.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable, Mapping
+from typing import Protocol, TypeVar
+
+from .adapters import ModelTarget
+
+
+class GraphModel(Protocol):
+    name: str
+    path: str
+    depends_on: list[str]
+
+
+M = TypeVar("M", bound=GraphModel)
+
+
+def find_by_names(models_by_name: Mapping[str, M], names: Iterable[str] | None) -> list[M]:
+    return [models_by_name[n] for n in names or () if n in models_by_name]
+
+
+def find_by_path(
+    models_by_name: Mapping[str, M], project_dir: str, base_path: str | None
+) -> list[M]:
+    """Models whose file lies under ``base_path`` (relative to ``project_dir``)."""
+
+    if not base_path:
+        return []
+    abs_base = os.path.abspath(os.path.join(project_dir, base_path))
+    out: list[M] = []
+    for m in models_by_name.values():
+        try:
+            if os.path.commonpath([abs_base, os.path.dirname(m.path)]) == abs_base:
+                out.append(m)
+        except ValueError:  # different drives on Windows
+            continue
+    return out
+
+
+def select_targets(selected: Iterable[M], models_by_name: Mapping[str, M]) -> list[ModelTarget]:
+    """Targets for ``selected`` in order, once per name; all models when none matched."""
+
+    chosen = list(selected) or list(models_by_name.values())
+    seen: set[str] = set()
+    out: list[ModelTarget] = []
+    for m in chosen:
+        if m.name in seen:
+            continue
+        seen.add(m.name)
+        out.append(ModelTarget(name=m.name, path=m.path))
+    return out
+
+
+def build_child_index(models: Iterable[M]) -> dict[str, list[M]]:
+    """Map each ``depends_on`` key to the models that depend on it."""
+
+    children: dict[str, list[M]] = {}
+    for m in models:
+        for dep in m.depends_on:
+            children.setdefault(dep, []).append(m)
+    return children
+
+
+def affected_targets(
+    paths: Iterable[str], models_by_path: Mapping[str, M], parent: Callable[[str], M | None]
+) -> list[ModelTarget]:
+    """Models defined in ``paths`` plus their direct parents.
+
+    A changed model can change which columns its parents must keep, so the
+    parents are re-checked too. ``parent`` resolves a ``depends_on`` key.
+    """
+
+    affected: dict[str, M] = {}
+    for path in paths:
+        model = models_by_path.get(os.path.abspath(path))
+        if model is None:
+            continue
+        affected.setdefault(model.name, model)
+        for dep in model.depends_on:
+            p = parent(dep)
+            if p is not None:
+                affected.setdefault(p.name, p)
+    return [ModelTarget(name=m.name, path=m.path) for m in affected.values()]
+
+
+def fanout_cost(model: M, children: Iterable[M], size: Callable[[M], int]) -> int:
+    """Cost of expanding ``model``: its own size plus that of every dependent.
+
+    Each dependent is analysed for column usage, so fan-out dominates.
+    """
+
+    return size(model) + 1 + sum(size(c) + 1 for c in children)
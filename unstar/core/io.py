@@ -2,7 +2,14 @@ from __future__ import annotations
 
 import difflib
 import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 def read_text(path: str) -> str:
@@ -26,3 +33,53 @@ def unified_diff(a_path: str, a_text: str, b_path: str, b_text: str) -> str:
             a_text.splitlines(), b_text.splitlines(), fromfile=a_path, tofile=b_path, lineterm=""
         )
     )
+
+
+def existing_files(paths: Iterable[str]) -> set[str]:
+    """Return the subset of ``paths`` that exist as files.
+
+    Paths are grouped by directory and each directory is listed with a single
+    ``os.scandir`` call, instead of one ``stat`` per path.
+    """
+
+    by_dir: dict[str, set[str]] = {}
+    for p in paths:
+        by_dir.setdefault(os.path.dirname(p), set()).add(p)
+
+    found: set[str] = set()
+    for directory, wanted in by_dir.items():
+        try:
+            with os.scandir(directory or ".") as it:
+                for entry in it:
+                    path = os.path.join(directory, entry.name)
+                    if path in wanted and entry.is_file():
+                        found.add(path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+    return found
+
+
+def prefetch(
+    load: Callable[[T], R], items: Iterable[T], depth: int = 8
+) -> Iterator[tuple[T, Future[R]]]:
+    """Yield ``(item, future)`` in order while up to ``depth`` later loads run ahead.
+
+    Errors raised by ``load`` surface from ``future.result()`` when the item is reached.
+    """
+
+    it = iter(items)
+    pool = ThreadPoolExecutor(max_workers=max(1, depth))
+    try:
+        pending: deque[tuple[T, Future[R]]] = deque()
+        for item in it:
+            pending.append((item, pool.submit(load, item)))
+            if len(pending) >= depth:
+                break
+        while pending:
+            current = pending.popleft()
+            for item in it:
+                pending.append((item, pool.submit(load, item)))
+                break
+            yield current
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,36 @@
+"""Replay of earlier expansion results for targets whose inputs did not change.
+
+An expansion is fully determined by the target's SQL, the column usage of its
+dependents and the unstar version. The last result per target is stored under
+a hash of those inputs, so an unchanged target skips the expander entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from .cache import cache_path, load_json, save_json
+
+MEMO_FILE = "results.json"
+
+# target name -> [key, columns, new SQL or None when unchanged]
+Memo = dict[str, list]
+
+
+def memo_key(sql: str, usage: str, version: str) -> str:
+    digest = hashlib.sha256()
+    for part in (version, usage, sql):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_memo(project_dir: str) -> Memo:
+    data = load_json(cache_path(project_dir, MEMO_FILE))
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if isinstance(v, list) and len(v) == 3}
+
+
+def save_memo(project_dir: str, memo: Memo) -> None:
+    save_json(cache_path(project_dir, MEMO_FILE), memo)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import math
+import os
+import sys
+from collections.abc import Iterable
+
+_UNITS = {"": 1024**2, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as ``512M`` or ``4G`` into bytes; bare numbers are MB."""
+
+    value = text.strip().upper().removesuffix("B")
+    unit = value[-1:] if value[-1:] in _UNITS else ""
+    number = value[: len(value) - len(unit)]
+    amount = float(number)
+    if not math.isfinite(amount):
+        raise ValueError(f"size must be finite: {text}")
+    size = int(amount * _UNITS[unit])
+    if size <= 0:
+        raise ValueError(f"size must be positive: {text}")
+    return size
+
+
+def read_ahead(budget: int, sizes: Iterable[int], limit: int) -> int:
+    """Files to read ahead so ``limit`` of the largest stay within 1/16 of ``budget``."""
+
+    largest = max(sizes, default=0)
+    return max(1, min(limit, budget // 16 // max(largest, 1)))
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024**2:.1f} MB"
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes, if the platform reports it."""
+
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def current_rss() -> int | None:
+    """Current resident set size in bytes; falls back to the peak off Linux."""
+
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss()
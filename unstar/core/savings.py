@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@dataclass
+class RelationStats:
+    """Column types and size of a relation read by a model, from local metadata."""
+
+    name: str
+    columns: dict[str, str]  # lower-cased column name -> data type
+    num_bytes: int | None  # table size, when the warehouse reported it
+
+
+@dataclass
+class Savings:
+    name: str
+    path: str
+    kept_columns: int  # columns in the expanded select list
+    total_columns: int  # 0 when no catalog data covers the upstream relations
+    pruned_columns: int
+    scanned_bytes: int | None  # bytes a SELECT * reads, when known
+    pruned_bytes: int | None  # estimated bytes no longer read after expansion
+
+
+# Rough average widths in bytes, used to split a table's size across columns
+_WIDTHS = [
+    (re.compile(r"bool"), 1),
+    (re.compile(r"json|variant|array|struct|object|map|super|geo"), 64),
+    (re.compile(r"char|text|string|binary|bytes|uuid"), 32),
+    (re.compile(r"tinyint|smallint|int2"), 2),
+    (re.compile(r"^date$"), 4),
+    (re.compile(r"decimal|numeric|number\(\d+,\s*[1-9]"), 16),
+    (re.compile(r"int|float|double|real|number|time"), 8),
+]
+_DEFAULT_WIDTH = 16
+
+
+def type_width(data_type: str) -> int:
+    t = data_type.lower()
+    for pattern, width in _WIDTHS:
+        if pattern.search(t):
+            return width
+    return _DEFAULT_WIDTH
+
+
+def estimate_savings(
+    name: str, path: str, columns: Iterable[str], relations: Iterable[RelationStats]
+) -> Savings:
+    """Estimate what expanding ``SELECT *`` to ``columns`` avoids reading.
+
+    Every upstream relation's columns not in ``columns`` count as pruned; bytes
+    are apportioned by estimated column width when the relation size is known.
+    """
+
+    keep = {c.lower() for c in columns}
+    # Relations without catalog data say nothing about what the star read
+    relations = [rel for rel in relations if rel.columns]
+    total = pruned = 0
+    scanned_bytes = pruned_bytes = 0
+    sized = False
+    for rel in relations:
+        total += len(rel.columns)
+        dropped = [t for c, t in rel.columns.items() if c not in keep]
+        pruned += len(dropped)
+        if rel.num_bytes is None:
+            continue
+        sized = True
+        width = sum(type_width(t) for t in rel.columns.values())
+        scanned_bytes += rel.num_bytes
+        pruned_bytes += rel.num_bytes * sum(type_width(t) for t in dropped) // width
+    return Savings(
+        name=name,
+        path=path,
+        kept_columns=len(keep),
+        total_columns=total,
+        pruned_columns=pruned,
+        scanned_bytes=scanned_bytes if sized else None,
+        pruned_bytes=pruned_bytes if sized else None,
+    )
+
+
+def format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.0f} B" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def rank(savings: Iterable[Savings]) -> list[Savings]:
+    """Biggest wins first: pruned bytes, then pruned columns."""
+
+    return sorted(savings, key=lambda s: (-(s.pruned_bytes or 0), -s.pruned_columns, s.name))
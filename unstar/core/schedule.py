@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import TypeVar
+
+from .cache import cache_path, load_json, save_json
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+TIMINGS_FILE = "timings.json"
+
+
+def load_timings(project_dir: str) -> dict[str, float]:
+    """Seconds measured per item (e.g. parsing a dependent) in earlier scheduled runs."""
+
+    data = load_json(cache_path(project_dir, TIMINGS_FILE))
+    if not isinstance(data, dict):
+        return {}
+    return {k: float(v) for k, v in data.items() if isinstance(v, (int, float))}
+
+
+def save_timings(project_dir: str, timings: dict[str, float]) -> None:
+    """Fold new measurements into the stored history (moving average)."""
+
+    if not timings:
+        return
+    history = load_timings(project_dir)
+    for name, seconds in timings.items():
+        previous = history.get(name)
+        history[name] = seconds if previous is None else (previous + seconds) / 2
+    save_json(cache_path(project_dir, TIMINGS_FILE), history)
+
+
+def expected_seconds(costs: dict[str, int], history: dict[str, float]) -> dict[str, float]:
+    """Expected seconds per item for longest-processing-time-first dispatch.
+
+    Measured seconds from ``history`` take precedence; items without history are
+    converted from their cost using the seconds-per-cost ratio of those with it.
+    """
+
+    known = [k for k in costs if k in history]
+    known_cost = sum(costs[k] for k in known)
+    rate = sum(history[k] for k in known) / known_cost if known_cost else 1.0
+    return {k: history.get(k, cost * rate) for k, cost in costs.items()}
+
+
+def parallel_map(
+    func: Callable[[T], R], items: Sequence[T], jobs: int, size: Callable[[T], float] = len
+) -> list[R]:
+    """Map ``func`` over ``items`` on ``jobs`` processes, largest items dispatched first.
+
+    Results are returned in input order. ``func`` must be picklable.
+    """
+
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    order = sorted(range(len(items)), key=lambda i: -size(items[i]))
+    results: list[R] = [None] * len(items)  # type: ignore[list-item]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for i, value in zip(order, pool.map(func, [items[i] for i in order])):
+            results[i] = value
+    return results
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import heapq
+from collections.abc import Callable, Sequence
+
+from .adapters import ModelTarget
+
+
+def parse_shard(text: str) -> tuple[int, int]:
+    """Parse ``INDEX/COUNT`` (1-based, e.g. ``2/4``)."""
+
+    try:
+        index_s, count_s = text.split("/")
+        index, count = int(index_s), int(count_s)
+    except ValueError:
+        raise ValueError(f"expected INDEX/COUNT, got {text!r}") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard index must be between 1 and {count}, got {text!r}")
+    return index, count
+
+
+def assign_shards(
+    targets: Sequence[ModelTarget], count: int, cost: Callable[[ModelTarget], int]
+) -> list[list[ModelTarget]]:
+    """Split targets into ``count`` shards of similar total cost.
+
+    Greedy longest-processing-time assignment: targets are taken by descending
+    cost (ties by name) and each goes to the currently lightest shard. The result
+    depends only on names and costs, so every CI node computes the same split.
+    Within a shard the input order is preserved.
+    """
+
+    costs = {t.name: cost(t) for t in targets}
+    heap = [(0, i) for i in range(count)]
+    owner: dict[str, int] = {}
+    for t in sorted(targets, key=lambda t: (-costs[t.name], t.name)):
+        load, i = heapq.heappop(heap)
+        owner[t.name] = i
+        heapq.heappush(heap, (load + costs[t.name], i))
+
+    shards: list[list[ModelTarget]] = [[] for _ in range(count)]
+    for t in targets:
+        shards[owner[t.name]].append(t)
+    return shards
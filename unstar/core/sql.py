@@ -1,4 +1,49 @@
 from __future__ import annotations
 
-# This module is reserved for future SQL utility functions
-# Currently, all SQL parsing is handled directly in expander.py using sqlglot
+from typing import Any
+
+
+def parse_statements(sql: str) -> list[Any]:
+    """Parse ``sql`` leniently with sqlglot; returns an empty list if unavailable."""
+
+    try:
+        import sqlglot
+    except Exception:
+        return []
+
+    try:
+        trees = sqlglot.parse(sql, error_level="ignore")
+    except Exception:
+        return []
+    return [t for t in trees if t is not None]
+
+
+def columns_in(trees: list[Any]) -> set[str]:
+    from sqlglot import exp
+
+    cols: set[str] = set()
+    for tree in trees:
+        for col in tree.find_all(exp.Column):
+            # Only bare identifiers (no star)
+            if col.name and col.name != "*":
+                cols.add(col.name)
+    return cols
+
+
+def tables_in(trees: list[Any]) -> set[str]:
+    """Names of relations read in FROM/JOIN clauses, excluding CTEs."""
+
+    from sqlglot import exp
+
+    tables: set[str] = set()
+    for tree in trees:
+        ctes = {cte.alias_or_name for cte in tree.find_all(exp.CTE)}
+        for table in tree.find_all(exp.Table):
+            if table.name and table.name not in ctes:
+                tables.add(table.name)
+    return tables
+
+
+def collect_columns(sql: str) -> set[str]:
+    trees = parse_statements(sql)
+    return columns_in(trees) if trees else set()
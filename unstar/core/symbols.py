@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import heapq
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+T = TypeVar("T", int, str)
+
+
+class SymbolTable:
+    """Interns column identifiers to dense integer ids.
+
+    Column sets are stored as sorted ``array('I')`` of those ids: each distinct name
+    is kept once, and a set costs four bytes per member however many ids exist.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, name: str) -> int:
+        idx = self._ids.get(name)
+        if idx is None:
+            idx = len(self._names)
+            name = sys.intern(name)
+            self._ids[name] = idx
+            self._names.append(name)
+        return idx
+
+    def encode(self, names: Iterable[str]) -> array:
+        """Return the sorted id array for ``names``, interning any new identifiers."""
+
+        return array("I", sorted({self.intern(n) for n in names}))
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        """Return the names for ``ids``, sorted."""
+
+        names = self._names
+        return sorted(names[i] for i in ids)
+
+
+def merge_unique(runs: Iterable[Iterable[T]]) -> Iterator[T]:
+    """Yield the items of sorted ``runs`` in order, each once (a k-way merge)."""
+
+    last = None
+    for item in heapq.merge(*runs):
+        if item != last:
+            yield item
+            last = item
+
+
+def union(sets: Iterable[array]) -> array:
+    """Merge sorted id arrays into one sorted array without duplicates."""
+
+    return array("I", merge_unique(sets))